@@ -15,6 +15,7 @@ import time
 import os
 import secrets
 import logging
+from collections import OrderedDict
 from typing import List
 from fastapi import Request, HTTPException, Depends
 from urllib.parse import urlparse
@@ -38,7 +39,10 @@ TIMESTAMP_WINDOW = 30  # seconds
 #
 # PRODUCTION FIX: Replace with a Redis SET with TTL to share nonce state across
 # any number of workers (e.g. redis.set(nonce, 1, ex=NONCE_EXPIRY, nx=True)).
-NONCE_CACHE: dict = {}  # {nonce: timestamp}
+#
+# Entries are kept in arrival order, so expiry pops from the front and stops at
+# the first live nonce instead of scanning the whole cache on every request.
+NONCE_CACHE: "OrderedDict[str, float]" = OrderedDict()  # {nonce: timestamp}
 NONCE_EXPIRY = 60  # seconds
 
 # Warn at import time if multi-worker mode is detected
@@ -69,14 +73,22 @@ def sign_request(method: str, path: str, service_id: str = None, secret: str = N
     if not sid or not sec:
         raise ValueError("SERVICE_ID and SERVICE_SECRET must be set")
 
+    return _signed_headers(sid, _hmac_prototype(sec), method, path)
+
+
+def _hmac_prototype(secret: str):
+    """HMAC-SHA256 keyed with secret; .copy() it per message to skip key setup."""
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
+def _signed_headers(sid: str, prototype, method: str, path: str) -> dict:
+    """Build auth headers, signing with a copy of a keyed HMAC prototype."""
     timestamp = str(int(time.time()))
     nonce = secrets.token_hex(8)
     message = f"{sid}:{timestamp}:{nonce}:{method.upper()}:{path}"
-    signature = hmac.new(
-        sec.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    mac = prototype.copy()
+    mac.update(message.encode())
+    signature = mac.hexdigest()
 
     return {
         "X-Service-ID": sid,
@@ -86,6 +98,10 @@ def sign_request(method: str, path: str, service_id: str = None, secret: str = N
     }
 
 
+# Keyed once at import; verify_request signs a copy per request
+_VERIFY_HMAC = _hmac_prototype(SERVICE_SECRET)
+
+
 def verify_request(
     service_id: str,
     timestamp: str,
@@ -169,11 +185,9 @@ def verify_request(
 
     # 4. Verify signature using constant-time comparison
     message = f"{service_id}:{timestamp}:{nonce}:{method.upper()}:{path}"
-    expected = "sha256=" + hmac.new(
-        SERVICE_SECRET.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).hexdigest()
+    mac = _VERIFY_HMAC.copy()
+    mac.update(message.encode())
+    expected = "sha256=" + mac.hexdigest()
 
     # Use hmac.compare_digest to prevent timing attacks
     if not hmac.compare_digest(expected, signature):
@@ -193,9 +207,11 @@ def verify_request(
 def _cleanup_nonces():
     """Remove expired nonces from cache to prevent memory leak."""
     cutoff = time.time() - NONCE_EXPIRY
-    expired = [n for n, t in NONCE_CACHE.items() if t < cutoff]
-    for n in expired:
-        del NONCE_CACHE[n]
+    while NONCE_CACHE:
+        oldest = next(iter(NONCE_CACHE.values()))
+        if oldest >= cutoff:
+            break
+        NONCE_CACHE.popitem(last=False)
 
 
 async def verify_service_request(
@@ -272,9 +288,11 @@ class SignedClient:
         if not service_id or not secret:
             raise ValueError("service_id and secret are required")
 
+        self._hmac = _hmac_prototype(secret)
+
     def _get_headers(self, method: str, path: str) -> dict:
         """Generate authentication headers for a request."""
-        return sign_request(method, path, self.service_id, self.secret)
+        return _signed_headers(self.service_id, self._hmac, method, path)
 
     async def post(self, client, url: str, **kwargs):
         """
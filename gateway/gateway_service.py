@@ -10,6 +10,7 @@ License: MIT
 from fastapi import FastAPI, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
+import asyncio
 import hmac
 import httpx
 import os
@@ -40,6 +41,9 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI(title="Gateway Service", version="2.0.0")
 
+# Max conversation turns buffered for RAG storage before new ones are dropped
+RAG_STORE_QUEUE_MAX = 100
+
 # ── Gateway API Key Middleware ────────────────────────────────────────────────
 # Protects all non-/health endpoints from unauthenticated public access.
 # Set GATEWAY_API_KEY in .env and send as X-API-Key header on every request.
@@ -202,32 +206,49 @@ class GatewayService:
         service_secret = os.getenv("SERVICE_SECRET", "")
         self.signed_client = SignedClient(service_id, service_secret) if service_secret else None
 
+        # Conversation turns waiting to be stored in RAG; drained by _rag_store_worker()
+        self._rag_queue: asyncio.Queue = asyncio.Queue(maxsize=RAG_STORE_QUEUE_MAX)
+
         logger.info(f"Gateway initialized - Vault: {self.vault_url}, Ollama: {self.ollama_url}, RAG: {self.rag_url}")
         logger.info(f"Auth enabled: {bool(self.signed_client)}")
         logger.info(f"Loaded {len(self.skill_matcher.skills)} total skills")
         logger.info(f"Search providers available: {self.search_detector.get_available_providers()}")
 
     async def _store_conversation(self, user_msg: str, bot_response: str, user_id: Optional[str] = None):
-        """Store conversation turn in RAG service for future context retrieval"""
+        """Queue a conversation turn for RAG storage without blocking the response"""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                url = f"{self.rag_url}/embed/conversation"
-                payload = {
-                    "user": user_msg[:500],  # Truncate long messages
-                    "assistant": bot_response[:500],
-                    "timestamp": datetime.now().isoformat(),
-                    "user_id": user_id  # for tenant isolation
-                }
-
-                if self.signed_client:
-                    await self.signed_client.post(client, url, json=payload)
-                else:
-                    await client.post(url, json=payload)
-
-                logger.debug("Conversation stored in RAG")
-        except Exception as e:
-            # Non-critical - don't fail on this
-            logger.debug(f"Failed to store conversation in RAG: {e}")
+            self._rag_queue.put_nowait({
+                "user": user_msg[:500],  # Truncate long messages
+                "assistant": bot_response[:500],
+                "timestamp": datetime.now().isoformat(),
+                "user_id": user_id  # for tenant isolation
+            })
+        except asyncio.QueueFull:
+            # Non-critical - RAG is behind, drop this turn rather than stall replies
+            logger.debug("RAG store queue full, dropping conversation turn")
+
+    async def _rag_store_worker(self):
+        """Background task: drain queued turns and post each burst over one client"""
+        url = f"{self.rag_url}/embed/conversation"
+        while True:
+            batch = [await self._rag_queue.get()]
+            while not self._rag_queue.empty():
+                batch.append(self._rag_queue.get_nowait())
+
+            try:
+                async with httpx.AsyncClient(timeout=5.0) as client:
+                    for payload in batch:
+                        try:
+                            if self.signed_client:
+                                await self.signed_client.post(client, url, json=payload)
+                            else:
+                                await client.post(url, json=payload)
+                        except Exception as e:
+                            # Non-critical - don't fail on this
+                            logger.debug(f"Failed to store conversation in RAG: {e}")
+                logger.debug(f"Stored {len(batch)} conversation turn(s) in RAG")
+            except Exception as e:
+                logger.debug(f"RAG store worker error: {e}")
 
     async def process_message(self, message: Message) -> Dict[str, Any]:
         """
@@ -428,6 +449,9 @@ async def startup_event():
     # Start ReAct Watchdog in background daemon thread
     start_watchdog()
 
+    # Drain queued conversation turns into RAG (keep a reference so the task isn't GC'd)
+    gateway.rag_store_task = asyncio.create_task(gateway._rag_store_worker())
+
     # Run seeding in background (non-blocking)
     asyncio.create_task(
         seed_classifier_examples_on_startup(
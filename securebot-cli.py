@@ -4,6 +4,10 @@ SecureBot CLI - Terminal TUI chat interface
 """
 
 import curses
+import collections
+import concurrent.futures
+import functools
+import selectors
 import threading
 import time
 import os
@@ -18,7 +22,8 @@ import re
 import textwrap
 
 # ── stdlib HTTP ──────────────────────────────────────────────────────────────
-import urllib.request
+import io
+import http.client
 import urllib.parse
 import urllib.error
 
@@ -33,8 +38,12 @@ PREFS_FILE            = os.path.expanduser("~/.securebot-cli-prefs.json")
 RESPONSE_MODEL        = os.getenv("RESPONSE_MODEL", "llama3.2:3b")  # overridden below after .env loads
 REFRESH_INTERVAL      = 3
 MAX_CHAT_LINES        = 100
+WRAP_CACHE_SIZE       = 4096  # memoized (line, width) wraps
 SYSTEM_PROMPT_REFRESH = 30
 APPROVAL_POLL_INTERVAL = 10   # seconds between approval / jobs polling
+MAX_FPS               = float(os.getenv("SECUREBOT_MAX_FPS", "30"))  # redraw cap; 0 disables
+SPINNER_INTERVAL      = 0.1   # spinner frame period while waiting on the gateway
+IDLE_WAKE_INTERVAL    = 0.5   # max sleep when idle (bounds resize latency)
 
 DRAW_LOG = "/tmp/securebot-draw.log"
 
@@ -113,6 +122,88 @@ def _sign_headers(method: str, path: str) -> dict:
         "X-Signature":  f"sha256={signature}"
     }
 
+# orjson is an optional speedup for (de)serialising gateway payloads — the
+# system prompt and history make these the largest documents the CLI handles.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+
+def _json_loads(data: bytes):
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+# ── Keep-alive connection pool ────────────────────────────────────────────────
+# urlopen opens a fresh TCP connection per call; the CLI talks to the same four
+# local services all session, so idle connections are parked here and reused.
+POOL_MAX_IDLE = 4  # idle connections kept per host
+
+_pool: dict = {}   # (scheme, netloc) -> [HTTPConnection]
+_pool_lock  = threading.Lock()
+
+
+def _pool_get(scheme: str, netloc: str, timeout: float):
+    """Return (connection, reused) for the host, reusing an idle one if available."""
+    with _pool_lock:
+        idle = _pool.get((scheme, netloc))
+        conn = idle.pop() if idle else None
+    if conn is None:
+        cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return cls(netloc, timeout=timeout), False
+    conn.timeout = timeout
+    return conn, True
+
+
+def _pool_put(scheme: str, netloc: str, conn):
+    with _pool_lock:
+        idle = _pool.setdefault((scheme, netloc), [])
+        if len(idle) < POOL_MAX_IDLE:
+            idle.append(conn)
+            return
+    conn.close()
+
+
+def _http_request(method: str, url: str, body: bytes = None, headers: dict = None,
+                  timeout: float = 5) -> bytes:
+    """Send a request over a pooled keep-alive connection and return the raw body.
+    Raises urllib.error.HTTPError / URLError like urlopen, so callers' handling is unchanged."""
+    parts = urllib.parse.urlsplit(url)
+    path  = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    for attempt in (0, 1):
+        conn, reused = _pool_get(parts.scheme, parts.netloc, timeout)
+        try:
+            if conn.sock:
+                conn.sock.settimeout(timeout)
+            conn.request(method, path, body=body, headers=headers or {})
+            resp = conn.getresponse()
+            data = resp.read()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            conn.close()
+            if reused and attempt == 0:
+                continue  # server dropped an idle keep-alive socket — retry on a fresh one
+            raise urllib.error.URLError(e)
+        except OSError as e:
+            conn.close()
+            raise urllib.error.URLError(e)
+        except Exception:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            _pool_put(parts.scheme, parts.netloc, conn)
+        if resp.status >= 400:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(data))
+        return data
+
+
 def http_get(url: str, headers: dict = None, timeout: int = 5, signed: bool = False):
     """HTTP GET with optional HMAC signing. Returns parsed JSON or raises."""
     req_headers = {"Accept": "application/json"}
@@ -121,9 +212,7 @@ def http_get(url: str, headers: dict = None, timeout: int = 5, signed: bool = Fa
     if signed:
         path = urllib.parse.urlparse(url).path
         req_headers.update(_sign_headers("GET", path))
-    req = urllib.request.Request(url, headers=req_headers)
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read())
+    return _json_loads(_http_request("GET", url, headers=req_headers, timeout=timeout))
 
 def http_post(url: str, payload: dict, headers: dict = None, timeout: int = 30, signed: bool = False):
     """HTTP POST with optional HMAC signing. Returns parsed JSON or raises."""
@@ -133,10 +222,8 @@ def http_post(url: str, payload: dict, headers: dict = None, timeout: int = 30,
     if signed:
         path = urllib.parse.urlparse(url).path
         req_headers.update(_sign_headers("POST", path))
-    data = json.dumps(payload).encode()
-    req = urllib.request.Request(url, data=data, headers=req_headers, method="POST")
-    with urllib.request.urlopen(req, timeout=timeout) as resp:
-        return json.loads(resp.read())
+    data = _json_dumps(payload)
+    return _json_loads(_http_request("POST", url, body=data, headers=req_headers, timeout=timeout))
 
 # ── Logging ───────────────────────────────────────────────────────────────────
 logging.basicConfig(
@@ -184,20 +271,26 @@ VERBOSITY_DESCRIPTIONS = {
     4: "Thorough with examples and context. Anticipate follow-ups.",
     5: "Comprehensive and conversational. Elaborate freely.",
 }
+# Pre-formatted /prefs lines
+TONE_LABELS      = {t: f"Tone {t}: {d}" for t, d in TONE_DESCRIPTIONS.items()}
+VERBOSITY_LABELS = {v: f"Verbosity {v}: {d}" for v, d in VERBOSITY_DESCRIPTIONS.items()}
 
 SPINNER_FRAMES = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
 
 # ── ChatBuffer ────────────────────────────────────────────────────────────────
 class ChatBuffer:
     def __init__(self):
-        self._lines = []
+        self._lines = collections.deque(maxlen=MAX_CHAT_LINES)  # O(1) append, oldest lines fall off
         self._lock  = threading.Lock()
+        self.version = 0  # bumped on every mutation so the renderer can skip unchanged frames
+
+    def __len__(self):
+        return len(self._lines)
 
     def add(self, text: str, color: int = 0):
         with self._lock:
             self._lines.append((text, color))
-            if len(self._lines) > MAX_CHAT_LINES:
-                self._lines = self._lines[-MAX_CHAT_LINES:]
+            self.version += 1
 
     def get_lines(self):
         with self._lock:
@@ -206,6 +299,92 @@ class ChatBuffer:
     def clear(self):
         with self._lock:
             self._lines.clear()
+            self.version += 1
+
+# ── WakeEvent ─────────────────────────────────────────────────────────────────
+class WakeEvent(threading.Event):
+    """Event that can also be select()ed on: set() writes a byte to a self-pipe
+    and clear() drains it, so the main loop sleeps until input or a redraw request."""
+    def __init__(self):
+        super().__init__()
+        self._r, self._w = os.pipe()
+        os.set_blocking(self._r, False)
+        os.set_blocking(self._w, False)
+
+    def fileno(self) -> int:
+        return self._r
+
+    def set(self):
+        # Byte first, then flag: however this interleaves with clear(), the
+        # flag ends up raised whenever a byte is left in the pipe, so the main
+        # loop never select()s on a readable pipe with the flag down and spins.
+        try:
+            os.write(self._w, b"\0")
+        except BlockingIOError:
+            pass  # pipe already full — the main loop is awake anyway
+        super().set()
+
+    def clear(self):
+        # Flag first, then drain: a set() racing with this leaves its flag up
+        super().clear()
+        try:
+            while os.read(self._r, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+# ── InputBuffer ───────────────────────────────────────────────────────────────
+class InputBuffer:
+    """Gap buffer for the input line — edits at the cursor are O(1) instead of
+    re-slicing the whole string per keystroke. Only printable ASCII is stored."""
+    def __init__(self):
+        self._left  = bytearray()  # text before the cursor
+        self._right = bytearray()  # text after the cursor, reversed
+
+    def __len__(self):
+        return len(self._left) + len(self._right)
+
+    @property
+    def cursor(self) -> int:
+        return len(self._left)
+
+    @property
+    def text(self) -> str:
+        return (self._left + self._right[::-1]).decode("ascii")
+
+    def insert(self, ch: int):
+        self._left.append(ch)
+
+    def backspace(self):
+        if self._left:
+            self._left.pop()
+
+    def delete(self):
+        if self._right:
+            self._right.pop()
+
+    def left(self):
+        if self._left:
+            self._right.append(self._left.pop())
+
+    def right(self):
+        if self._right:
+            self._left.append(self._right.pop())
+
+    def home(self):
+        self._right.extend(reversed(self._left))
+        self._left.clear()
+
+    def end(self):
+        self._left.extend(reversed(self._right))
+        self._right.clear()
+
+    def kill_to_end(self):
+        self._right.clear()
+
+    def clear(self):
+        self._left.clear()
+        self._right.clear()
 
 # ── Prefs ─────────────────────────────────────────────────────────────────────
 class Prefs:
@@ -235,8 +414,7 @@ class Prefs:
 class ResourceMonitor:
     def __init__(self, redraw_event: threading.Event):
         self._event    = redraw_event
-        self._lock     = threading.Lock()
-        self._snapshot = {}
+        self._snapshot = {}  # replaced wholesale by _run(), never mutated in place
         self._thread   = threading.Thread(target=self._run, daemon=True)
         self._running  = True
 
@@ -249,8 +427,9 @@ class ResourceMonitor:
         self._running = False
 
     def snapshot(self):
-        with self._lock:
-            return dict(self._snapshot)
+        """Latest sample published by the monitor thread. Treat as read-only:
+        it is shared, not copied, since redraw() asks for it every frame."""
+        return self._snapshot
 
     def _run(self):
         time.sleep(0.5)  # allow cpu_percent prime to settle
@@ -306,8 +485,7 @@ class ResourceMonitor:
             except Exception as e:
                 logging.error(f"Monitor error: {e}")
 
-            with self._lock:
-                self._snapshot = data
+            self._snapshot = data  # single reference swap — readers see old or new, never partial
             self._event.set()
             time.sleep(max(0, REFRESH_INTERVAL - 1))  # -1 for the cpu_percent(interval=1) block
 
@@ -319,25 +497,22 @@ class SystemPromptBuilder:
         self._prompt = ""
         self._skills = []
         self._tasks  = {}
+        self._sections_key = None  # fingerprint the cached sections were built from
+        self._sections     = None  # (soul, user, session, skills_text, tasks_text, tone, verbosity)
 
     def build(self, last_user_msg: str = "hello") -> str:
         """Build and cache the system prompt. Safe to call from any thread (file I/O only)."""
-        def read_file(path, label):
-            try:
-                with open(path) as f:
-                    return f.read()
-            except FileNotFoundError:
-                logging.warning(f"Memory file missing: {path}")
-                return ""
-            except Exception as e:
-                logging.warning(f"Error reading {label}: {e}")
-                return ""
-
-        soul    = read_file(os.path.join(MEMORY_DIR, "soul.md"),    "soul.md")
-        user    = read_file(os.path.join(MEMORY_DIR, "user.md"),    "user.md")
-        session = read_file(os.path.join(MEMORY_DIR, "session.md"), "session.md")
+        # File-backed sections are only re-read when a stat() fingerprint changes
+        key = self._fingerprint()
+        with self._lock:
+            sections = self._sections if key == self._sections_key else None
+        if sections is None:
+            sections = self._load_sections()
+            with self._lock:
+                self._sections_key, self._sections = key, sections
+        soul, user, session, skills_text, tasks_text, tone_inst, verb_inst = sections
 
-        # RAG context
+        # RAG context — depends on the query, so it is fetched every time
         rag_context = ""
         try:
             query = urllib.parse.quote(last_user_msg[:200])
@@ -347,16 +522,6 @@ class SystemPromptBuilder:
         except Exception as e:
             logging.warning(f"RAG unreachable: {e}")
 
-        # Skills
-        skills_text = self._load_skills_text()
-
-        # Tasks
-        tasks_text = self._load_tasks_text()
-
-        # Tone / verbosity
-        tone_inst = TONE_DESCRIPTIONS.get(self._prefs.tone, TONE_DESCRIPTIONS[2])
-        verb_inst = VERBOSITY_DESCRIPTIONS.get(self._prefs.verbosity, VERBOSITY_DESCRIPTIONS[3])
-
         parts = [
             "Answer only what is asked. Do not invent session IDs, timestamps,\n"
             "privacy policies, or procedures not mentioned in the context.\n"
@@ -395,6 +560,61 @@ class SystemPromptBuilder:
         with self._lock:
             return self._prompt
 
+    def _watched_paths(self) -> list:
+        skills_dir = os.path.join(os.path.dirname(MEMORY_DIR), "skills")
+        paths = [os.path.join(MEMORY_DIR, name)
+                 for name in ("soul.md", "user.md", "session.md", "tasks.json")]
+        paths.append(skills_dir)
+        try:
+            for name in sorted(os.listdir(skills_dir)):
+                paths.append(os.path.join(skills_dir, name, "skill.json"))
+                paths.append(os.path.join(skills_dir, name, "SKILL.md"))
+        except OSError:
+            pass
+        return paths
+
+    def _fingerprint(self) -> bytes:
+        """Cheap key over everything _load_sections() depends on: mtime + size of the
+        memory and skill files, plus the tone/verbosity prefs."""
+        h = hashlib.blake2b(digest_size=16)
+        h.update(f"{self._prefs.tone}:{self._prefs.verbosity}".encode())
+        for path in self._watched_paths():
+            try:
+                st = os.stat(path)
+                h.update(f"\0{path}:{st.st_mtime_ns}:{st.st_size}".encode())
+            except OSError:
+                h.update(f"\0{path}:-".encode())
+        return h.digest()
+
+    def _load_sections(self) -> tuple:
+        """Read the file-backed parts of the prompt (everything except RAG context)."""
+        def read_file(path, label):
+            try:
+                with open(path) as f:
+                    return f.read()
+            except FileNotFoundError:
+                logging.warning(f"Memory file missing: {path}")
+                return ""
+            except Exception as e:
+                logging.warning(f"Error reading {label}: {e}")
+                return ""
+
+        soul    = read_file(os.path.join(MEMORY_DIR, "soul.md"),    "soul.md")
+        user    = read_file(os.path.join(MEMORY_DIR, "user.md"),    "user.md")
+        session = read_file(os.path.join(MEMORY_DIR, "session.md"), "session.md")
+
+        # Skills
+        skills_text = self._load_skills_text()
+
+        # Tasks
+        tasks_text = self._load_tasks_text()
+
+        # Tone / verbosity
+        tone_inst = TONE_DESCRIPTIONS.get(self._prefs.tone, TONE_DESCRIPTIONS[2])
+        verb_inst = VERBOSITY_DESCRIPTIONS.get(self._prefs.verbosity, VERBOSITY_DESCRIPTIONS[3])
+
+        return soul, user, session, skills_text, tasks_text, tone_inst, verb_inst
+
     def _load_skills_text(self) -> str:
         skills_dir = os.path.join(os.path.dirname(MEMORY_DIR), "skills")
         lines = []
@@ -444,22 +664,69 @@ class SystemPromptBuilder:
             logging.warning(f"Tasks load error: {e}")
             return ""
 
+# ── Word wrap ─────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=WRAP_CACHE_SIZE)
+def _wrap(text: str, width: int, attr: int) -> tuple:
+    """Word-wrap text with smart paragraph handling for multi-line bot responses.
+    Memoized: chat history is re-wrapped whenever it changes, but each line's
+    wrap only depends on (text, width, attr)."""
+    if width <= 0:
+        return ((text, attr),)
+    result = []
+    # Split on blank lines to get paragraphs
+    paragraphs = re.split(r'\n\s*\n', text)
+    for p_idx, para in enumerate(paragraphs):
+        lines = para.split('\n')
+        # Detect structured content: bullets, code fences, headers
+        is_structured = any(
+            l.strip().startswith(('- ', '* ', '• ', '```', '# '))
+            for l in lines if l.strip()
+        )
+        if is_structured:
+            # Preserve structure; word-wrap each line individually
+            for line in lines:
+                if not line.strip():
+                    result.append(('', attr))
+                else:
+                    for wl in (textwrap.wrap(line, width) or [line]):
+                        result.append((wl, attr))
+        else:
+            # Prose: join continuation lines, then rewrap as single paragraph
+            joined = ' '.join(l.strip() for l in lines if l.strip())
+            if joined:
+                for wl in (textwrap.wrap(joined, width) or [joined]):
+                    result.append((wl, attr))
+            else:
+                result.append(('', attr))
+        # Blank separator between paragraphs (not after the last one)
+        if p_idx < len(paragraphs) - 1:
+            result.append(('', attr))
+    return tuple(result) or (('', attr),)
+
 # ── SecureBotApp ──────────────────────────────────────────────────────────────
 class SecureBotApp:
     def __init__(self, stdscr):
         self.stdscr = stdscr
         self.chat   = ChatBuffer()
         self.prefs  = Prefs()
-        self._redraw_needed = threading.Event()
+        self._redraw_needed = WakeEvent()
         self._running       = True
         self._thinking      = False
         self._spinner_idx   = 0
         self._last_draw     = 0.0
+        self._hostname      = os.uname().nodename if hasattr(os, "uname") else "local"
+        self._hline_str     = ""
+        self._attr: dict    = {}  # color pair id -> curses attr, filled in setup()
+        self._min_frame_interval = 1.0 / MAX_FPS if MAX_FPS > 0 else 0.0
         self._worker_thread = None
 
-        self.input_buf  = ""
-        self.cursor_pos = 0
+        self.input  = InputBuffer()
         self.scroll_offset = 0
+        self._recalc_prefix()
+
+        # Chat pane damage tracking: (chat version, scroll, h, w) and (top, bottom) rows of last paint
+        self._chat_key    = None
+        self._chat_region = None
 
         # ── Dashboard / approval state ─────────────────────────────────────
         self._view              = "chat"          # "chat" or "dashboard"
@@ -470,6 +737,9 @@ class SecureBotApp:
         self.monitor   = ResourceMonitor(self._redraw_needed)
         self.sp_builder = SystemPromptBuilder(self.prefs)
 
+        # Bind command handlers once so dispatch is a single dict lookup
+        self._handlers = {verb: getattr(self, name) for verb, name in self._COMMANDS.items()}
+
     # ── Setup ─────────────────────────────────────────────────────────────────
     def setup(self):
         curses.cbreak()
@@ -496,6 +766,13 @@ class SecureBotApp:
         curses.init_pair(C_MAGENTA, curses.COLOR_MAGENTA,-1)
         curses.init_pair(C_BOLD,    curses.COLOR_WHITE,  -1)
 
+        # Resolve every pair once; the renderers look attrs up here instead of
+        # calling color_pair() dozens of times per frame
+        self._attr = {pair: curses.color_pair(pair) for pair in (
+            C_HEADER, C_USER, C_BOT, C_DIM, C_GREEN, C_YELLOW,
+            C_RED, C_CYAN, C_MAGENTA, C_BOLD,
+        )}
+
     # ── Main loop ─────────────────────────────────────────────────────────────
     def run(self):
         self.setup()
@@ -508,24 +785,38 @@ class SecureBotApp:
         # Background approval/jobs poller
         threading.Thread(target=self._approval_poll_loop, daemon=True).start()
 
+        # Block until a key arrives or a worker sets _redraw_needed, instead of polling
+        wake = selectors.DefaultSelector()
+        wake.register(sys.stdin.fileno(), selectors.EVENT_READ)
+        wake.register(self._redraw_needed, selectors.EVENT_READ)
+
         self.stdscr.nodelay(True)
         while self._running:
-            time.sleep(0.02)
             ch = self.stdscr.getch()
-            if ch == -1:
-                if self._redraw_needed.is_set():
-                    self._redraw_needed.clear()
-                    self.redraw()
-                elif time.time() - self._last_draw > 0.3:
-                    self.redraw()
-                    self._last_draw = time.time()
-                # advance spinner if thinking
-                if self._thinking:
-                    self._spinner_idx = (self._spinner_idx + 1) % len(SPINNER_FRAMES)
+            if ch != -1:
+                # Drain everything queued (e.g. a paste) before painting once; don't
+                # paint per keystroke — mark dirty and let the frame budget coalesce
+                while ch != -1 and self._running:
+                    self.handle_key(ch)
+                    ch = self.stdscr.getch()
+                self._redraw_needed.set()
+
+            if not self._redraw_needed.is_set():
+                # getch() returned -1, so curses has nothing buffered and select() on
+                # stdin is safe. The timeout bounds resize latency and ticks the spinner.
+                if not wake.select(timeout=SPINNER_INTERVAL if self._thinking else IDLE_WAKE_INTERVAL):
+                    if self._thinking:
+                        self._spinner_idx = (self._spinner_idx + 1) % len(SPINNER_FRAMES)
+                        self._redraw_needed.set()
+                continue
+            since = time.time() - self._last_draw
+            if since < self._min_frame_interval:
+                time.sleep(self._min_frame_interval - since)
                 continue
-            self.handle_key(ch)
+            self._redraw_needed.clear()
             self.redraw()
 
+        wake.close()
         self.monitor.stop()
         curses.curs_set(0)
 
@@ -533,19 +824,16 @@ class SecureBotApp:
     def _ollama_warmup(self):
         """Send a tiny request to force model load before first user message."""
         try:
-            payload = json.dumps({
-                "model": RESPONSE_MODEL,
-                "prompt": "hi",
-                "stream": False,
-                "options": {"num_predict": 1}
-            }).encode()
-            req = urllib.request.Request(
+            http_post(
                 "http://localhost:11434/api/generate",
-                data=payload,
-                headers={"Content-Type": "application/json"},
-                method="POST"
+                {
+                    "model": RESPONSE_MODEL,
+                    "prompt": "hi",
+                    "stream": False,
+                    "options": {"num_predict": 1}
+                },
+                timeout=60,
             )
-            urllib.request.urlopen(req, timeout=60)
             self.chat.add("Model warmed up.", curses.color_pair(C_DIM))
         except Exception as e:
             self.chat.add(f"Warmup warning: {e}", curses.color_pair(C_YELLOW))
@@ -632,10 +920,11 @@ class SecureBotApp:
 
     def _handle_dashboard_key(self, ch: int):
         """Key handling while in dashboard view."""
-        if ch in (10, 13):  # Enter — attempt to resolve or execute command
-            text = self.input_buf.strip()
-            self.input_buf  = ""
-            self.cursor_pos = 0
+        if 32 <= ch <= 126:  # printable first — most common
+            self.input.insert(ch)
+        elif ch in (10, 13):  # Enter — attempt to resolve or execute command
+            text = self.input.text.strip()
+            self.input.clear()
             if not text:
                 return
             # "/jobs" returns to chat view
@@ -661,26 +950,19 @@ class SecureBotApp:
         elif ch == 3:  # Ctrl-C — return to chat
             self._view = "chat"
         elif ch in (curses.KEY_BACKSPACE, 127, 8):
-            if self.cursor_pos > 0:
-                self.input_buf  = self.input_buf[:self.cursor_pos-1] + self.input_buf[self.cursor_pos:]
-                self.cursor_pos -= 1
+            self.input.backspace()
         elif ch == curses.KEY_DC:
-            if self.cursor_pos < len(self.input_buf):
-                self.input_buf = self.input_buf[:self.cursor_pos] + self.input_buf[self.cursor_pos+1:]
+            self.input.delete()
         elif ch == curses.KEY_LEFT:
-            self.cursor_pos = max(0, self.cursor_pos - 1)
+            self.input.left()
         elif ch == curses.KEY_RIGHT:
-            self.cursor_pos = min(len(self.input_buf), self.cursor_pos + 1)
+            self.input.right()
         elif ch in (curses.KEY_HOME, 1):
-            self.cursor_pos = 0
+            self.input.home()
         elif ch in (curses.KEY_END, 5):
-            self.cursor_pos = len(self.input_buf)
+            self.input.end()
         elif ch == 21:  # Ctrl-U
-            self.input_buf  = ""
-            self.cursor_pos = 0
-        elif 32 <= ch <= 126:
-            self.input_buf = self.input_buf[:self.cursor_pos] + chr(ch) + self.input_buf[self.cursor_pos:]
-            self.cursor_pos += 1
+            self.input.clear()
 
     def _resolve_approval(self, approval: dict, resolution: str):
         """POST resolution to gateway in a background thread."""
@@ -710,30 +992,28 @@ class SecureBotApp:
         if self._view == "dashboard":
             self._handle_dashboard_key(ch)
             return
-        if ch in (10, 13):  # Enter
+        if 32 <= ch <= 126:  # printable — by far the most common key, test it first
+            self.input.insert(ch)
+        elif ch in (10, 13):  # Enter
             self._submit()
         elif ch == 3:  # Ctrl-C
             self._running = False
         elif ch in (curses.KEY_BACKSPACE, 127, 8):
-            if self.cursor_pos > 0:
-                self.input_buf  = self.input_buf[:self.cursor_pos-1] + self.input_buf[self.cursor_pos:]
-                self.cursor_pos -= 1
+            self.input.backspace()
         elif ch == curses.KEY_DC:
-            if self.cursor_pos < len(self.input_buf):
-                self.input_buf = self.input_buf[:self.cursor_pos] + self.input_buf[self.cursor_pos+1:]
+            self.input.delete()
         elif ch == curses.KEY_LEFT:
-            self.cursor_pos = max(0, self.cursor_pos - 1)
+            self.input.left()
         elif ch == curses.KEY_RIGHT:
-            self.cursor_pos = min(len(self.input_buf), self.cursor_pos + 1)
+            self.input.right()
         elif ch in (curses.KEY_HOME, 1):  # Home / Ctrl-A
-            self.cursor_pos = 0
+            self.input.home()
         elif ch in (curses.KEY_END, 5):  # End / Ctrl-E
-            self.cursor_pos = len(self.input_buf)
+            self.input.end()
         elif ch == 21:  # Ctrl-U
-            self.input_buf  = ""
-            self.cursor_pos = 0
+            self.input.clear()
         elif ch == 11:  # Ctrl-K
-            self.input_buf  = self.input_buf[:self.cursor_pos]
+            self.input.kill_to_end()
         elif ch == curses.KEY_UP:
             self.scroll_offset += 1
         elif ch == curses.KEY_DOWN:
@@ -742,17 +1022,13 @@ class SecureBotApp:
             self.scroll_offset += 5
         elif ch == curses.KEY_NPAGE:
             self.scroll_offset = max(0, self.scroll_offset - 5)
-        elif 32 <= ch <= 126:
-            self.input_buf = self.input_buf[:self.cursor_pos] + chr(ch) + self.input_buf[self.cursor_pos:]
-            self.cursor_pos += 1
 
     # ── Submit ────────────────────────────────────────────────────────────────
     def _submit(self):
-        text = self.input_buf.strip()
+        text = self.input.text.strip()
         if not text:
             return
-        self.input_buf  = ""
-        self.cursor_pos = 0
+        self.input.clear()
         self.scroll_offset = 0
 
         if text.startswith("/"):
@@ -763,49 +1039,74 @@ class SecureBotApp:
             self._send_message(text)
 
     # ── Commands ──────────────────────────────────────────────────────────────
+    # Verb → handler method name. Aliases share a handler; every handler takes the raw arg.
+    _COMMANDS = {
+        "/memory":    "_cmd_memory",
+        "/edit":      "_cmd_edit",
+        "/session":   "_cmd_session",
+        "/reload":    "_cmd_reload",
+        "/tasks":     "_cmd_tasks",
+        "/task":      "_cmd_add_task",
+        "/tone":      "_cmd_tone",
+        "/t":         "_cmd_tone",
+        "/verbosity": "_cmd_verbosity",
+        "/v":         "_cmd_verbosity",
+        "/prefs":     "_cmd_prefs",
+        "/skills":    "_cmd_skills",
+        "/status":    "_cmd_status",
+        "/clear":     "_cmd_clear",
+        "/help":      "_cmd_help",
+        "/quit":      "_cmd_quit",
+        "/exit":      "_cmd_quit",
+        "/cc":        "_cmd_cc",
+        "/haiku":     "_cmd_haiku",
+        "/jobs":      "_cmd_jobs",
+    }
+
+    _HELP_LINES = tuple(
+        (line, C_YELLOW if line.startswith("──") else C_USER) for line in (
+            "── Help ──",
+            "/memory            Show soul.md + user.md",
+            "/edit <soul|user|session>  Open file in editor",
+            "/session <note>    Append note to session.md",
+            "/reload            Reload memory files",
+            "/tasks             Show tasks",
+            "/task <desc>       Add a task",
+            "/tone /t <1-3>     Set tone (1=formal 3=casual)",
+            "/verbosity /v <1-5> Set verbosity",
+            "/prefs             Show current preferences",
+            "/skills            List gateway skills",
+            "/status            Health check all services",
+            "/clear             Clear chat",
+            "/cc <prompt>       Delegate to Claude Code",
+            "/haiku <prompt>    Ask Claude Haiku directly",
+            "/jobs              System Dashboard (jobs + approvals)",
+            "/quit /exit        Exit",
+            "PgUp/PgDn ↑↓      Scroll chat",
+            "Ctrl-A/E           Cursor home/end",
+            "Ctrl-U             Clear input",
+            "Ctrl-K             Kill to end",
+        )
+    )
+
     def _run_command(self, text: str):
         parts = text.split(None, 1)
         cmd   = parts[0].lower()
         arg   = parts[1] if len(parts) > 1 else ""
 
-        if cmd == "/memory":
-            self._cmd_memory()
-        elif cmd == "/edit":
-            self._cmd_edit(arg)
-        elif cmd == "/session":
-            self._cmd_session(arg)
-        elif cmd == "/reload":
-            self._cmd_reload()
-        elif cmd == "/tasks":
-            self._cmd_tasks()
-        elif cmd == "/task":
-            self._cmd_add_task(arg)
-        elif cmd in ("/tone", "/t"):
-            self._cmd_tone(arg)
-        elif cmd in ("/verbosity", "/v"):
-            self._cmd_verbosity(arg)
-        elif cmd == "/prefs":
-            self._cmd_prefs()
-        elif cmd == "/skills":
-            self._cmd_skills()
-        elif cmd == "/status":
-            self._cmd_status()
-        elif cmd == "/clear":
-            self.chat.clear()
-        elif cmd == "/help":
-            self._cmd_help()
-        elif cmd in ("/quit", "/exit"):
-            self._running = False
-        elif cmd == "/cc":
-            self._cmd_cc(arg)
-        elif cmd == "/haiku":
-            self._cmd_haiku(arg)
-        elif cmd == "/jobs":
-            self._cmd_jobs()
-        else:
+        handler = self._handlers.get(cmd)
+        if handler is None:
             self.chat.add(f"Unknown command: {cmd}  (type /help)", curses.color_pair(C_RED))
+        else:
+            handler(arg)
 
-    def _cmd_memory(self):
+    def _cmd_clear(self, arg: str = ""):
+        self.chat.clear()
+
+    def _cmd_quit(self, arg: str = ""):
+        self._running = False
+
+    def _cmd_memory(self, arg: str = ""):
         for fname in ("soul.md", "user.md"):
             path = os.path.join(MEMORY_DIR, fname)
             self.chat.add(f"── {fname} ──", curses.color_pair(C_YELLOW))
@@ -835,6 +1136,7 @@ class SecureBotApp:
         curses.noecho()
         self.stdscr.clear()
         self.stdscr.refresh()
+        self._chat_key = None
         self.sp_builder.build()
         self.chat.add(f"Edited {which}.md and rebuilt system prompt.", curses.color_pair(C_GREEN))
         self._redraw_needed.set()
@@ -852,7 +1154,7 @@ class SecureBotApp:
         except Exception as e:
             self.chat.add(f"Error saving session: {e}", curses.color_pair(C_RED))
 
-    def _cmd_reload(self):
+    def _cmd_reload(self, arg: str = ""):
         try:
             self.sp_builder.build()
             self.chat.add("Memory files reloaded and system prompt rebuilt.", curses.color_pair(C_GREEN))
@@ -860,7 +1162,7 @@ class SecureBotApp:
             self.chat.add(f"Reload error: {e}", curses.color_pair(C_RED))
         self._redraw_needed.set()
 
-    def _cmd_tasks(self):
+    def _cmd_tasks(self, arg: str = ""):
         path = os.path.join(MEMORY_DIR, "tasks.json")
         try:
             with open(path) as f:
@@ -922,6 +1224,7 @@ class SecureBotApp:
             return
         self.prefs.tone = val
         self.prefs.save()
+        self._recalc_prefix()
         self.sp_builder.build()
         self.chat.add(f"Tone set to {val}: {TONE_DESCRIPTIONS[val]}", curses.color_pair(C_GREEN))
         self._redraw_needed.set()
@@ -935,23 +1238,22 @@ class SecureBotApp:
             return
         self.prefs.verbosity = val
         self.prefs.save()
+        self._recalc_prefix()
         self.sp_builder.build()
         self.chat.add(f"Verbosity set to {val}: {VERBOSITY_DESCRIPTIONS[val]}", curses.color_pair(C_GREEN))
         self._redraw_needed.set()
 
-    def _cmd_prefs(self):
+    def _cmd_prefs(self, arg: str = ""):
         t = self.prefs.tone
         v = self.prefs.verbosity
-        self.chat.add(f"Tone {t}: {TONE_DESCRIPTIONS.get(t,'?')}", curses.color_pair(C_USER))
-        self.chat.add(f"Verbosity {v}: {VERBOSITY_DESCRIPTIONS.get(v,'?')}", curses.color_pair(C_USER))
+        self.chat.add(TONE_LABELS.get(t) or f"Tone {t}: ?", curses.color_pair(C_USER))
+        self.chat.add(VERBOSITY_LABELS.get(v) or f"Verbosity {v}: ?", curses.color_pair(C_USER))
         self._redraw_needed.set()
 
-    def _cmd_skills(self):
+    def _cmd_skills(self, arg: str = ""):
         def _do():
             try:
-                url = f"{GATEWAY_URL}/health"
-                with urllib.request.urlopen(url, timeout=5) as resp:
-                    data = json.loads(resp.read())
+                data = http_get(f"{GATEWAY_URL}/health", timeout=5)
                 skills = data.get("skills", [])
                 if skills:
                     self.chat.add("── Skills ──", curses.color_pair(C_YELLOW))
@@ -965,7 +1267,7 @@ class SecureBotApp:
             self._redraw_needed.set()
         threading.Thread(target=_do, daemon=True).start()
 
-    def _cmd_status(self):
+    def _cmd_status(self, arg: str = ""):
         def _do():
             checks = [
                 ("Gateway",  f"{GATEWAY_URL}/health",           False),
@@ -974,47 +1276,33 @@ class SecureBotApp:
                 ("RAG",      f"{RAG_URL}/health",               True),
                 ("Ollama",   "http://localhost:11434/api/tags",  False),
             ]
-            self.chat.add("── Status ──", curses.color_pair(C_YELLOW))
-            for name, url, signed in checks:
+            def probe(check) -> bool:
+                _, url, signed = check
                 try:
                     if signed:
                         http_get(url, timeout=3, signed=True)
                     else:
-                        with urllib.request.urlopen(url, timeout=3):
-                            pass
-                    self.chat.add(f"  ✓ {name}", curses.color_pair(C_GREEN))
+                        _http_request("GET", url, timeout=3)
+                    return True
                 except Exception:
+                    return False
+
+            # Probe all services at once: worst case is one timeout, not one per service
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(checks)) as ex:
+                results = list(ex.map(probe, checks))
+
+            self.chat.add("── Status ──", curses.color_pair(C_YELLOW))
+            for (name, _, _), ok in zip(checks, results):
+                if ok:
+                    self.chat.add(f"  ✓ {name}", curses.color_pair(C_GREEN))
+                else:
                     self.chat.add(f"  ✗ {name}", curses.color_pair(C_RED))
             self._redraw_needed.set()
         threading.Thread(target=_do, daemon=True).start()
 
-    def _cmd_help(self):
-        lines = [
-            "── Help ──",
-            "/memory            Show soul.md + user.md",
-            "/edit <soul|user|session>  Open file in editor",
-            "/session <note>    Append note to session.md",
-            "/reload            Reload memory files",
-            "/tasks             Show tasks",
-            "/task <desc>       Add a task",
-            "/tone /t <1-3>     Set tone (1=formal 3=casual)",
-            "/verbosity /v <1-5> Set verbosity",
-            "/prefs             Show current preferences",
-            "/skills            List gateway skills",
-            "/status            Health check all services",
-            "/clear             Clear chat",
-            "/cc <prompt>       Delegate to Claude Code",
-            "/haiku <prompt>    Ask Claude Haiku directly",
-            "/jobs              System Dashboard (jobs + approvals)",
-            "/quit /exit        Exit",
-            "PgUp/PgDn ↑↓      Scroll chat",
-            "Ctrl-A/E           Cursor home/end",
-            "Ctrl-U             Clear input",
-            "Ctrl-K             Kill to end",
-        ]
-        for line in lines:
-            attr = curses.color_pair(C_YELLOW) if line.startswith("──") else curses.color_pair(C_USER)
-            self.chat.add(line, attr)
+    def _cmd_help(self, arg: str = ""):
+        for line, color in self._HELP_LINES:
+            self.chat.add(line, curses.color_pair(color))
         self._redraw_needed.set()
 
     def _cmd_cc(self, prompt: str):
@@ -1030,12 +1318,27 @@ class SecureBotApp:
             try:
                 proc = subprocess.Popen(
                     ["claude", "-p", "--dangerously-skip-permissions", prompt],
-                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+                    stdout=subprocess.PIPE, stderr=subprocess.STDOUT, bufsize=0
                 )
-                for line in proc.stdout:
-                    line = line.rstrip("\n")
-                    self.chat.add(f"[Claude Code] {line}", curses.color_pair(C_YELLOW))
+                # Read whatever the pipe has (up to 64K) per syscall rather than a line
+                # at a time, and request one redraw per chunk instead of per line.
+                fd      = proc.stdout.fileno()
+                pending = b""
+                while True:
+                    chunk = os.read(fd, 65536)
+                    if not chunk:
+                        break
+                    *lines, pending = (pending + chunk).split(b"\n")
+                    for line in lines:
+                        self.chat.add(f"[Claude Code] {line.decode('utf-8', 'replace')}",
+                                      curses.color_pair(C_YELLOW))
+                    if lines:
+                        self._redraw_needed.set()
+                if pending:
+                    self.chat.add(f"[Claude Code] {pending.decode('utf-8', 'replace')}",
+                                  curses.color_pair(C_YELLOW))
                     self._redraw_needed.set()
+                proc.stdout.close()
                 proc.wait()
             except Exception as e:
                 self.chat.add(f"[Claude Code] Error: {e}", curses.color_pair(C_RED))
@@ -1052,9 +1355,7 @@ class SecureBotApp:
             api_key = None
             # Try vault first
             try:
-                url = f"{VAULT_URL}/v1/secret/data/anthropic"
-                with urllib.request.urlopen(url, timeout=5) as resp:
-                    data = json.loads(resp.read())
+                data = http_get(f"{VAULT_URL}/v1/secret/data/anthropic", timeout=5)
                 api_key = (data.get("data", {}).get("data", {}).get("anthropic_api_key")
                            or data.get("data", {}).get("anthropic_api_key"))
             except Exception:
@@ -1077,23 +1378,19 @@ class SecureBotApp:
                 return
 
             try:
-                payload = json.dumps({
-                    "model":      "claude-haiku-4-5-20251001",
-                    "max_tokens": 1000,
-                    "messages":   [{"role": "user", "content": prompt}],
-                }).encode()
-                req = urllib.request.Request(
+                data = http_post(
                     "https://api.anthropic.com/v1/messages",
-                    data=payload,
+                    {
+                        "model":      "claude-haiku-4-5-20251001",
+                        "max_tokens": 1000,
+                        "messages":   [{"role": "user", "content": prompt}],
+                    },
                     headers={
-                        "Content-Type":      "application/json",
                         "x-api-key":         api_key,
                         "anthropic-version": "2023-06-01",
                     },
-                    method="POST",
+                    timeout=30,
                 )
-                with urllib.request.urlopen(req, timeout=30) as resp:
-                    data = json.loads(resp.read())
                 text = data["content"][0]["text"]
                 self.chat.add(f"[Haiku] {text}", curses.color_pair(C_MAGENTA))
             except Exception as e:
@@ -1102,11 +1399,10 @@ class SecureBotApp:
 
         threading.Thread(target=_do, daemon=True).start()
 
-    def _cmd_jobs(self):
+    def _cmd_jobs(self, arg: str = ""):
         """Switch to the System Dashboard view."""
         self._view = "dashboard"
-        self.input_buf  = ""
-        self.cursor_pos = 0
+        self.input.clear()
         self._redraw_needed.set()
 
     # ── Send message to gateway ───────────────────────────────────────────────
@@ -1120,25 +1416,18 @@ class SecureBotApp:
         def _worker():
             try:
                 system_prompt = self.sp_builder.build(text)
-                payload = json.dumps({
+                payload = {
                     "channel":     "cli",
                     "user_id":     USER_ID,
                     "text":        text,
                     "system":      system_prompt,
                     "temperature": 0.7,
-                }).encode()
-                gw_headers = {"Content-Type": "application/json"}
+                }
+                gw_headers = {}
                 if GATEWAY_API_KEY:
                     gw_headers["X-API-Key"] = GATEWAY_API_KEY
-                req = urllib.request.Request(
-                    f"{GATEWAY_URL}/message",
-                    data=payload,
-                    headers=gw_headers,
-                    method="POST",
-                )
                 t0 = time.time()
-                with urllib.request.urlopen(req, timeout=120) as resp:
-                    data = json.loads(resp.read())
+                data = http_post(f"{GATEWAY_URL}/message", payload, headers=gw_headers, timeout=120)
                 elapsed = time.time() - t0
                 bot_text = data.get("response") or data.get("text") or data.get("message") or ""
                 meta     = data.get("metadata", {})
@@ -1167,6 +1456,8 @@ class SecureBotApp:
 
     # ── Drawing ───────────────────────────────────────────────────────────────
     def redraw(self):
+        # Only the UI loop draws (curses is not thread-safe); worker threads
+        # request a frame through _redraw_needed instead of painting.
         try:
             if self._view == "dashboard":
                 self._do_dashboard_redraw()
@@ -1182,19 +1473,28 @@ class SecureBotApp:
 
     def _do_redraw(self):
         h, w = self.stdscr.getmaxyx()
-        self.stdscr.erase()
+        # Chat history rarely changes between frames; when it hasn't, leave its rows
+        # on screen and only repaint the header/resources/input around it.
+        chat_key  = (self.chat.version, self.scroll_offset, h, w)
+        keep_chat = self._chat_region is not None and chat_key == self._chat_key
+        if keep_chat:
+            top, bottom = self._chat_region
+            self._clear_rows(0, top)
+            self._clear_rows(bottom, h)
+        else:
+            self.stdscr.erase()
         snap = self.monitor.snapshot()
 
         row = 0
 
         # ── Header ────────────────────────────────────────────────────────────
-        hostname  = os.uname().nodename if hasattr(os, "uname") else "local"
+        hostname  = self._hostname
         with self._approval_lock:
             n_pending = len([a for a in self._pending_approvals if a.get("status") == "pending"])
         alert = f" [!{n_pending} APPROVALS /jobs]" if n_pending else ""
         header = (f" SecureBot CLI | {RESPONSE_MODEL} | {hostname} | "
                   f"tone:{self.prefs.tone}|v:{self.prefs.verbosity}{alert}")
-        header_attr = curses.color_pair(C_HEADER) | curses.A_BOLD
+        header_attr = self._attr[C_HEADER] | curses.A_BOLD
         self._safe_addstr(row, 0, header[:w].ljust(w), header_attr)
         row += 1
 
@@ -1236,7 +1536,7 @@ class SecureBotApp:
                     gpu  = snap.get("gpu",  0)
                     gpu_bar = self._bar(gpu, right_w - 17)
                     line2 = f" GPU  {gpu_bar} {gpu:4.0f}%"
-                    self._safe_addstr(row, mid, line2[:right_w], curses.color_pair(C_CYAN))
+                    self._safe_addstr(row, mid, line2[:right_w], self._attr[C_CYAN])
                 row += 1
 
             if row < h:
@@ -1246,27 +1546,27 @@ class SecureBotApp:
                     vram = snap.get("vram", 0)
                     vram_bar = self._bar(vram, right_w - 17)
                     line2 = f" VRAM {vram_bar} {vram:4.0f}%"
-                    self._safe_addstr(row, mid, line2[:right_w], curses.color_pair(C_CYAN))
+                    self._safe_addstr(row, mid, line2[:right_w], self._attr[C_CYAN])
                 row += 1
 
             if row < h:
                 line = f" {disk_str}"
-                self._safe_addstr(row, 0, line[:left_w], curses.color_pair(C_GREEN))
+                self._safe_addstr(row, 0, line[:left_w], self._attr[C_GREEN])
                 if gpu_avail and right_w > 0:
                     temp = snap.get("gpu_temp", 0)
                     line2 = f" GPU Temp: {temp:.0f}°C"
-                    self._safe_addstr(row, mid, line2[:right_w], curses.color_pair(C_CYAN))
+                    self._safe_addstr(row, mid, line2[:right_w], self._attr[C_CYAN])
                 row += 1
 
             # ── Separator ─────────────────────────────────────────────────────
             if row < h:
-                self._safe_addstr(row, 0, "─" * w, curses.color_pair(C_DIM))
+                self._hline(row, w)
                 row += 1
 
             # ── Process table ─────────────────────────────────────────────────
             if row < h:
                 hdr = f" {'PID':>6}  {'CPU%':>5}  {'MEM%':>5}  PROCESS"
-                self._safe_addstr(row, 0, hdr[:w], curses.color_pair(C_YELLOW))
+                self._safe_addstr(row, 0, hdr[:w], self._attr[C_YELLOW])
                 row += 1
             procs = snap.get("procs", [])
             for proc in procs[:2]:
@@ -1277,7 +1577,7 @@ class SecureBotApp:
                 mem_p = proc.get("memory_percent") or 0
                 name  = (proc.get("name") or "")[:max(1, w - 25)]
                 line  = f" {pid:>6}  {cpu_p:>5.1f}  {mem_p:>5.1f}  {name}"
-                self._safe_addstr(row, 0, line[:w], curses.color_pair(C_USER))
+                self._safe_addstr(row, 0, line[:w], self._attr[C_USER])
                 row += 1
 
             # Pad process section to at least 2 rows after header
@@ -1289,7 +1589,7 @@ class SecureBotApp:
 
         # ── Separator before chat ─────────────────────────────────────────────
         if chat_top < h:
-            self._safe_addstr(chat_top, 0, "─" * w, curses.color_pair(C_DIM))
+            self._hline(chat_top, w)
             chat_top += 1
 
         # ── Input line position ───────────────────────────────────────────────
@@ -1298,51 +1598,34 @@ class SecureBotApp:
         chat_h     = max(0, input_row - chat_top)
 
         # ── Chat area ─────────────────────────────────────────────────────────
-        raw_lines = self.chat.get_lines()
-        # Word-wrap each line
-        wrapped = []
-        for (text, attr) in raw_lines:
-            wrapped.extend(self._wrap(text, w, attr))
-
-        # Scroll clamp
-        max_scroll = max(0, len(wrapped) - chat_h)
-        self.scroll_offset = min(self.scroll_offset, max_scroll)
-        self.scroll_offset = max(0, self.scroll_offset)
-
-        # Visible slice (pin to bottom unless scrolled)
-        if self.scroll_offset == 0:
-            visible = wrapped[-chat_h:] if chat_h > 0 else []
-        else:
-            end_idx = max(0, len(wrapped) - self.scroll_offset)
-            start_idx = max(0, end_idx - chat_h)
-            visible = wrapped[start_idx:end_idx]
-
-        for i, (line, attr) in enumerate(visible):
-            if chat_top + i >= input_row:
-                break
-            self._safe_addstr(chat_top + i, 0, line[:w].ljust(w), attr)
+        if keep_chat and (chat_top, input_row) != self._chat_region:
+            # Panel above the chat changed height — fall back to a full repaint
+            self._chat_key = None
+            return self._do_redraw()
+        if not keep_chat:
+            self._draw_chat(chat_top, input_row, chat_h, w)
 
         # ── Input line ────────────────────────────────────────────────────────
         _final_cursor = None
         if input_row < h:
-            prefix = f"[tone:{self.prefs.tone}|v:{self.prefs.verbosity}] "
             if self._thinking:
                 sp = SPINNER_FRAMES[self._spinner_idx % len(SPINNER_FRAMES)]
                 prefix_shown = f"{sp} "
             else:
-                prefix_shown = prefix
+                prefix_shown = self._prompt_prefix
 
             avail     = max(0, w - len(prefix_shown) - 1)
-            buf       = self.input_buf
+            buf       = self.input.text
+            cursor    = self.input.cursor
             # Pan if cursor out of view
             view_start = 0
-            if self.cursor_pos >= avail:
-                view_start = self.cursor_pos - avail + 1
+            if cursor >= avail:
+                view_start = cursor - avail + 1
             view_buf   = buf[view_start:view_start + avail]
-            cursor_col = len(prefix_shown) + (self.cursor_pos - view_start)
+            cursor_col = len(prefix_shown) + (cursor - view_start)
 
             input_line = prefix_shown + view_buf
-            self._safe_addstr(input_row, 0, input_line[:w].ljust(w), curses.color_pair(C_USER))
+            self._safe_addstr(input_row, 0, input_line[:w].ljust(w), self._attr[C_USER])
             cursor_col = min(cursor_col, w - 1)
             # Save position; move AFTER refresh so it is not overwritten
             _final_cursor = (input_row, cursor_col)
@@ -1351,9 +1634,9 @@ class SecureBotApp:
         if status_row < h and status_row != input_row:
             if self._thinking:
                 status = " ⏳ Waiting for response..."
-                self._safe_addstr(status_row, 0, status[:w].ljust(w), curses.color_pair(C_DIM))
+                self._safe_addstr(status_row, 0, status[:w].ljust(w), self._attr[C_DIM])
             else:
-                self._safe_addstr(status_row, 0, " " * w, curses.color_pair(C_DIM))
+                self._safe_addstr(status_row, 0, " " * w, self._attr[C_DIM])
 
         self.stdscr.refresh()
         # Place cursor AFTER refresh to ensure correct terminal position
@@ -1363,10 +1646,41 @@ class SecureBotApp:
             except curses.error:
                 pass
 
+    def _draw_chat(self, chat_top: int, input_row: int, chat_h: int, w: int):
+        version   = self.chat.version  # read first: a racing add() just forces another paint
+        raw_lines = self.chat.get_lines()
+        # Word-wrap each line
+        wrapped = []
+        for (text, attr) in raw_lines:
+            wrapped.extend(_wrap(text, w, attr))
+
+        # Scroll clamp
+        max_scroll = max(0, len(wrapped) - chat_h)
+        self.scroll_offset = min(self.scroll_offset, max_scroll)
+        self.scroll_offset = max(0, self.scroll_offset)
+
+        # Visible slice (pin to bottom unless scrolled)
+        if self.scroll_offset == 0:
+            visible = wrapped[-chat_h:] if chat_h > 0 else []
+        else:
+            end_idx = max(0, len(wrapped) - self.scroll_offset)
+            start_idx = max(0, end_idx - chat_h)
+            visible = wrapped[start_idx:end_idx]
+
+        for i, (line, attr) in enumerate(visible):
+            if chat_top + i >= input_row:
+                break
+            self._safe_addstr(chat_top + i, 0, line[:w].ljust(w), attr)
+
+        h, _ = self.stdscr.getmaxyx()
+        self._chat_key    = (version, self.scroll_offset, h, w)
+        self._chat_region = (chat_top, input_row)
+
     # ── Dashboard renderer ────────────────────────────────────────────────────
     def _do_dashboard_redraw(self):
         h, w = self.stdscr.getmaxyx()
         self.stdscr.erase()
+        self._chat_key = None
 
         with self._approval_lock:
             approvals = list(self._pending_approvals)
@@ -1376,15 +1690,15 @@ class SecureBotApp:
 
         # ── Header bar ────────────────────────────────────────────────────────
         title = " SYSTEM DASHBOARD  [Ctrl-C or /jobs to return to chat]"
-        self._safe_addstr(row, 0, title[:w].ljust(w), curses.color_pair(C_HEADER) | curses.A_BOLD)
+        self._safe_addstr(row, 0, title[:w].ljust(w), self._attr[C_HEADER] | curses.A_BOLD)
         row += 1
 
         # ── Background Jobs section ───────────────────────────────────────────
         if row < h:
-            self._safe_addstr(row, 0, "─" * w, curses.color_pair(C_DIM))
+            self._hline(row, w)
             row += 1
         if row < h:
-            self._safe_addstr(row, 0, " BACKGROUND JOBS", curses.color_pair(C_YELLOW) | curses.A_BOLD)
+            self._safe_addstr(row, 0, " BACKGROUND JOBS", self._attr[C_YELLOW] | curses.A_BOLD)
             row += 1
 
         jobs = jobs_data.get("jobs", {})
@@ -1393,29 +1707,29 @@ class SecureBotApp:
 
         if watchdog_note and row < h:
             note = f"  [!] {watchdog_note}"
-            self._safe_addstr(row, 0, note[:w], curses.color_pair(C_YELLOW))
+            self._safe_addstr(row, 0, note[:w], self._attr[C_YELLOW])
             row += 1
         elif not jobs and row < h:
-            self._safe_addstr(row, 0, "  No job data available (watchdog not yet run)", curses.color_pair(C_DIM))
+            self._safe_addstr(row, 0, "  No job data available (watchdog not yet run)", self._attr[C_DIM])
             row += 1
 
         if jobs and row < h:
             col_w = max(1, min(24, w // 4))
             hdr = f"  {'JOB':<{col_w}}{'LAST CHECK':<20}{'STATUS':<10}DIAGNOSIS"
-            self._safe_addstr(row, 0, hdr[:w], curses.color_pair(C_YELLOW))
+            self._safe_addstr(row, 0, hdr[:w], self._attr[C_YELLOW])
             row += 1
 
         for unit, entry in list(jobs.items()):
             if row >= h - 4:
                 if row < h:
-                    self._safe_addstr(row, 0, f"  ... ({len(jobs)} total jobs)", curses.color_pair(C_DIM))
+                    self._safe_addstr(row, 0, f"  ... ({len(jobs)} total jobs)", self._attr[C_DIM])
                     row += 1
                 break
             failed  = entry.get("failed", False)
             active  = entry.get("active", False)
             status  = "FAILED" if failed else ("OK" if active else "inactive")
-            attr    = curses.color_pair(C_RED) if failed else (
-                      curses.color_pair(C_GREEN) if active else curses.color_pair(C_DIM))
+            attr    = self._attr[C_RED] if failed else (
+                      self._attr[C_GREEN] if active else self._attr[C_DIM])
             last_chk = (entry.get("last_check") or "")[:16]
             diag    = ""
             d = entry.get("diagnosis")
@@ -1435,21 +1749,21 @@ class SecureBotApp:
             row += 1
 
         if updated and row < h:
-            self._safe_addstr(row, 0, f"  Updated: {updated[:19]}", curses.color_pair(C_DIM))
+            self._safe_addstr(row, 0, f"  Updated: {updated[:19]}", self._attr[C_DIM])
             row += 1
 
         # ── Pending Approvals section ─────────────────────────────────────────
         if row < h:
-            self._safe_addstr(row, 0, "─" * w, curses.color_pair(C_DIM))
+            self._hline(row, w)
             row += 1
         if row < h:
             hdr2 = f" PENDING APPROVALS ({len(approvals)})"
-            attr2 = curses.color_pair(C_RED) | curses.A_BOLD if approvals else curses.color_pair(C_YELLOW) | curses.A_BOLD
+            attr2 = self._attr[C_RED] | curses.A_BOLD if approvals else self._attr[C_YELLOW] | curses.A_BOLD
             self._safe_addstr(row, 0, hdr2[:w], attr2)
             row += 1
 
         if not approvals and row < h:
-            self._safe_addstr(row, 0, "  No pending approvals.", curses.color_pair(C_DIM))
+            self._safe_addstr(row, 0, "  No pending approvals.", self._attr[C_DIM])
             row += 1
 
         for i, appr in enumerate(approvals):
@@ -1462,12 +1776,12 @@ class SecureBotApp:
             created   = (appr.get("created_at") or "")[:16]
             line1 = f"  {idx_str} {rationale}"
             line2 = f"      Created: {created} | needs: {needs} | type: {rtype}"
-            color = curses.color_pair(C_RED) if rtype == "credential" else curses.color_pair(C_YELLOW)
+            color = self._attr[C_RED] if rtype == "credential" else self._attr[C_YELLOW]
             if row < h:
                 self._safe_addstr(row, 0, line1[:w], color)
                 row += 1
             if row < h:
-                self._safe_addstr(row, 0, line2[:w], curses.color_pair(C_DIM))
+                self._safe_addstr(row, 0, line2[:w], self._attr[C_DIM])
                 row += 1
 
         # ── Input line ────────────────────────────────────────────────────────
@@ -1476,23 +1790,24 @@ class SecureBotApp:
 
         if input_row < h:
             if row < input_row:
-                self._safe_addstr(row, 0, "─" * w, curses.color_pair(C_DIM))
+                self._hline(row, w)
 
             prompt = " [<#> <value> to resolve | /jobs to exit] "
             avail  = max(0, w - len(prompt) - 1)
-            buf    = self.input_buf
+            buf    = self.input.text
+            cursor = self.input.cursor
             view_start = 0
-            if self.cursor_pos >= avail:
-                view_start = self.cursor_pos - avail + 1
+            if cursor >= avail:
+                view_start = cursor - avail + 1
             view_buf   = buf[view_start:view_start + avail]
-            cursor_col = len(prompt) + (self.cursor_pos - view_start)
+            cursor_col = len(prompt) + (cursor - view_start)
 
             input_line = prompt + view_buf
-            self._safe_addstr(input_row, 0, input_line[:w].ljust(w), curses.color_pair(C_CYAN))
+            self._safe_addstr(input_row, 0, input_line[:w].ljust(w), self._attr[C_CYAN])
             cursor_col = min(cursor_col, w - 1)
 
         if status_row < h and status_row != input_row:
-            self._safe_addstr(status_row, 0, " " * w, curses.color_pair(C_DIM))
+            self._safe_addstr(status_row, 0, " " * w, self._attr[C_DIM])
 
         self.stdscr.refresh()
         if input_row < h:
@@ -1502,6 +1817,24 @@ class SecureBotApp:
                 pass
 
     # ── Drawing helpers ───────────────────────────────────────────────────────
+    def _hline(self, row: int, w: int):
+        """Full-width separator; the rule string is rebuilt only when the width changes."""
+        if len(self._hline_str) != w:
+            self._hline_str = "─" * w
+        self._safe_addstr(row, 0, self._hline_str, self._attr[C_DIM])
+
+    def _recalc_prefix(self):
+        """Input-line prefix only changes with /tone or /verbosity — format it then, not per frame."""
+        self._prompt_prefix = f"[tone:{self.prefs.tone}|v:{self.prefs.verbosity}] "
+
+    def _clear_rows(self, start: int, end: int):
+        for row in range(max(0, start), end):
+            try:
+                self.stdscr.move(row, 0)
+                self.stdscr.clrtoeol()
+            except curses.error:
+                pass
+
     def _safe_addstr(self, row: int, col: int, text: str, attr: int = 0):
         h, w = self.stdscr.getmaxyx()
         if row < 0 or row >= h or col < 0 or col >= w:
@@ -1519,46 +1852,11 @@ class SecureBotApp:
 
     def _bar_color(self, pct: float) -> int:
         if pct > 90:
-            return curses.color_pair(C_RED)
+            return self._attr[C_RED]
         elif pct > 80:
-            return curses.color_pair(C_YELLOW)
+            return self._attr[C_YELLOW]
         else:
-            return curses.color_pair(C_GREEN)
-
-    def _wrap(self, text: str, width: int, attr: int):
-        """Word-wrap text with smart paragraph handling for multi-line bot responses."""
-        if width <= 0:
-            return [(text, attr)]
-        result = []
-        # Split on blank lines to get paragraphs
-        paragraphs = re.split(r'\n\s*\n', text)
-        for p_idx, para in enumerate(paragraphs):
-            lines = para.split('\n')
-            # Detect structured content: bullets, code fences, headers
-            is_structured = any(
-                l.strip().startswith(('- ', '* ', '• ', '```', '# '))
-                for l in lines if l.strip()
-            )
-            if is_structured:
-                # Preserve structure; word-wrap each line individually
-                for line in lines:
-                    if not line.strip():
-                        result.append(('', attr))
-                    else:
-                        for wl in (textwrap.wrap(line, width) or [line]):
-                            result.append((wl, attr))
-            else:
-                # Prose: join continuation lines, then rewrap as single paragraph
-                joined = ' '.join(l.strip() for l in lines if l.strip())
-                if joined:
-                    for wl in (textwrap.wrap(joined, width) or [joined]):
-                        result.append((wl, attr))
-                else:
-                    result.append(('', attr))
-            # Blank separator between paragraphs (not after the last one)
-            if p_idx < len(paragraphs) - 1:
-                result.append(('', attr))
-        return result or [('', attr)]
+            return self._attr[C_GREEN]
 
 
 # ── Entry point ───────────────────────────────────────────────────────────────
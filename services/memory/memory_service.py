@@ -5,14 +5,18 @@ Minimal FastAPI service for memory file management.
 Just reads/writes memory files, no complex logic.
 """
 
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Response, Depends
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ValidationError
+from anyio import to_thread
+from typing import Optional, Dict, Any, List, Tuple, Type, TypeVar
 from datetime import datetime
-import json
+import asyncio
+import mmap
+import orjson
 import os
 import sys
+import time
 import httpx
 import logging
 from pathlib import Path
@@ -25,7 +29,7 @@ from common.auth import verify_service_request, SignedClient, create_auth_depend
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="SecureBot Memory Service")
+app = FastAPI(title="SecureBot Memory Service", default_response_class=ORJSONResponse)
 
 # Configuration
 MEMORY_DIR = os.getenv("MEMORY_DIR", "/home/tasker0/securebot/memory")
@@ -36,6 +40,9 @@ SESSION_FILE = f"{MEMORY_DIR}/session.md"
 TASKS_FILE = f"{MEMORY_DIR}/tasks.json"
 HEARTBEAT_LOG = f"{MEMORY_DIR}/heartbeat.log"
 
+# Session updates within this window collapse into one RAG re-embed
+REEMBED_DEBOUNCE_SECONDS = float(os.getenv("REEMBED_DEBOUNCE_SECONDS", "2.0"))
+
 # Auth configuration
 ALLOWED_CALLERS = os.getenv("ALLOWED_CALLERS", "gateway,rag-service,heartbeat").split(",")
 SERVICE_ID = os.getenv("SERVICE_ID", "memory-service")
@@ -44,6 +51,9 @@ SERVICE_SECRET = os.getenv("SERVICE_SECRET", "")
 # Initialize signed client for outgoing requests
 signed_client = SignedClient(SERVICE_ID, SERVICE_SECRET) if SERVICE_SECRET else None
 
+# Shared keep-alive client for calls to the RAG service (opened on startup)
+http_client: Optional[httpx.AsyncClient] = None
+
 # Create auth dependency
 auth_required = create_auth_dependency(ALLOWED_CALLERS)
 
@@ -77,53 +87,224 @@ class TaskUpdate(BaseModel):
 
 
 # Utility functions
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+async def parse_body(request: Request, model: Type[ModelT]) -> ModelT:
+    """Parse and validate a JSON request body in a single pydantic-core pass"""
+    try:
+        return model.model_validate_json(await request.body())
+    except ValidationError as e:
+        # No input: for json_invalid it is the raw body bytes, which the
+        # HTTPException handler can't serialize (it would turn into a 500)
+        raise HTTPException(
+            status_code=422,
+            detail=e.errors(include_url=False, include_context=False, include_input=False)
+        )
+
+
+_now_iso_cache: Tuple[int, str] = (0, "")
+
+
+def now_iso() -> str:
+    """Local ISO-8601 timestamp, formatted at most once per second"""
+    global _now_iso_cache
+    second = int(time.time())
+    cached = _now_iso_cache
+    if cached[0] != second:
+        cached = _now_iso_cache = (second, datetime.fromtimestamp(second).isoformat())
+    return cached[1]
+
+
+_O_NOATIME = getattr(os, "O_NOATIME", 0)
+
+
+def _open_rdonly(filepath: str) -> int:
+    """Open for reading without an atime update (O_NOATIME needs file ownership)"""
+    if _O_NOATIME:
+        try:
+            return os.open(filepath, os.O_RDONLY | _O_NOATIME)
+        except PermissionError:
+            pass
+    return os.open(filepath, os.O_RDONLY)
+
+
+def _read_bytes(filepath: str) -> bytes:
+    """Whole-file read sized from fstat, bypassing the buffered io stack"""
+    fd = _open_rdonly(filepath)
+    try:
+        chunks = [os.read(fd, os.fstat(fd).st_size or 65536)]
+        while chunks[-1]:
+            chunks.append(os.read(fd, 65536))
+    finally:
+        os.close(fd)
+    return b"".join(chunks)
+
+
+class _MmapCache:
+    """
+    Decoded contents of the markdown memory files, keyed by path + mtime.
+
+    soul.md/user.md/session.md are read on every /memory/* and /memory/context
+    call but rarely change. On a miss the file is mapped read-only and decoded
+    once; an unchanged file costs a stat and a dict lookup.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple] = {}  # {path: ((mtime_ns, size), text)}
+
+    def read(self, filepath: str) -> str:
+        st = os.stat(filepath)
+        entry = self._entries.get(filepath)
+        if entry is not None and entry[0] == (st.st_mtime_ns, st.st_size):
+            return entry[1]
+
+        fd = _open_rdonly(filepath)
+        try:
+            st = os.fstat(fd)
+            if st.st_size == 0:
+                text = ""  # mmap refuses zero-length files
+            else:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise") and hasattr(mmap, "MADV_WILLNEED"):
+                        mm.madvise(mmap.MADV_WILLNEED)
+                    text = mm[:].decode("utf-8")
+        finally:
+            os.close(fd)
+
+        self._entries[filepath] = ((st.st_mtime_ns, st.st_size), text)
+        return text
+
+    def invalidate(self, filepath: str):
+        self._entries.pop(filepath, None)
+
+
+_md_cache = _MmapCache()
+
+# /memory/context response body, keyed by the (mtime_ns, size) of its three files
+_context_cache: Optional[Tuple[tuple, bytes]] = None
+
+
+def _file_key(filepath: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
 def read_file(filepath: str) -> str:
     """Read file contents"""
     try:
-        with open(filepath, 'r') as f:
-            return f.read()
+        return _md_cache.read(filepath)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File not found: {filepath}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _atomic_write_bytes(filepath: str, data: bytes, durable: bool = True):
+    """
+    Replace filepath with data via a temp file + os.replace.
+
+    Readers see either the old or the new file, never a truncated one. The
+    existing file's mode is kept, and a read-only target (soul.md is 444)
+    is refused just as open(..., 'w') would refuse it.
+    """
+    mode = 0o644
+    try:
+        st = os.stat(filepath)
+        mode = st.st_mode & 0o7777
+        if not os.access(filepath, os.W_OK):
+            raise PermissionError(f"Permission denied: {filepath}")
+    except FileNotFoundError:
+        pass
+
+    tmp_path = f"{filepath}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if durable:
+            os.fsync(fd)
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+    os.close(fd)
+    os.replace(tmp_path, filepath)
+
+
 def write_file(filepath: str, content: str):
     """Write file contents"""
+    global _context_cache
     try:
-        with open(filepath, 'w') as f:
-            f.write(content)
+        # session.md is rewritten constantly and only needs atomicity
+        _atomic_write_bytes(filepath, content.encode("utf-8"), durable=filepath != SESSION_FILE)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        _md_cache.invalidate(filepath)
+        _context_cache = None
 
 
 async def trigger_reembedding():
     """Trigger RAG service to re-embed memory after updates"""
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            if signed_client:
-                response = await signed_client.post(client, f"{RAG_URL}/embed/memory")
-            else:
-                # Fallback for local dev without auth
-                response = await client.post(f"{RAG_URL}/embed/memory")
-
-            if response.status_code == 200:
-                logger.info("RAG re-embedding triggered successfully")
-            else:
-                logger.warning(f"RAG re-embedding failed: HTTP {response.status_code}")
+        if signed_client:
+            response = await signed_client.post(http_client, f"{RAG_URL}/embed/memory")
+        else:
+            # Fallback for local dev without auth
+            response = await http_client.post(f"{RAG_URL}/embed/memory")
+
+        if response.status_code == 200:
+            logger.info("RAG re-embedding triggered successfully")
+        else:
+            logger.warning(f"RAG re-embedding failed: HTTP {response.status_code}")
     except Exception as e:
         # Non-critical - log but don't fail the memory update
         logger.warning(f"Could not trigger RAG re-embedding: {e}")
 
 
+_reembed_task: Optional[asyncio.Task] = None
+_reembed_deadline: float = 0.0
+
+
+def schedule_reembedding():
+    """
+    Debounced trigger_reembedding: fire once REEMBED_DEBOUNCE_SECONDS after
+    the last call. Returns immediately; a burst of session updates costs a
+    single POST to the RAG service.
+    """
+    global _reembed_task, _reembed_deadline
+    loop = asyncio.get_running_loop()
+    _reembed_deadline = loop.time() + REEMBED_DEBOUNCE_SECONDS
+    if _reembed_task is None or _reembed_task.done():
+        _reembed_task = loop.create_task(_debounced_reembed())
+
+
+async def _debounced_reembed():
+    loop = asyncio.get_running_loop()
+    while True:
+        delay = _reembed_deadline - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            continue
+        started = loop.time()
+        await trigger_reembedding()
+        # An update that landed during the POST needs one more pass
+        if _reembed_deadline <= started:
+            return
+
+
 def read_json(filepath: str) -> Dict[str, Any]:
     """Read JSON file"""
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        return orjson.loads(_read_bytes(filepath))
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File not found: {filepath}")
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         raise HTTPException(status_code=500, detail=f"Invalid JSON: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -132,46 +313,193 @@ def read_json(filepath: str) -> Dict[str, Any]:
 def write_json(filepath: str, data: Dict[str, Any]):
     """Write JSON file"""
     try:
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2)
+        _atomic_write_bytes(filepath, orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def tail_lines(filepath: str, n: int, block_size: int = 8192) -> List[str]:
+    """Last n lines of a file, read backwards from EOF in block_size chunks"""
+    with open(filepath, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # first line of the window may be partial
+    return [line.decode("utf-8", "replace") for line in lines[-n:]]
+
+
+CURRENT_TASK_HEADER = "## Current Task"
+
+
+def patch_current_task(content: str, task: str) -> str:
+    """
+    Replace the body of the "## Current Task" section with task.
+
+    The header is any line equal to "## Current Task" once stripped, so
+    indentation and CRLF endings still match. The section runs up to the
+    next line starting with "##" (or EOF), and the new body is written with
+    the header line's own line ending. Located with str.find, which scans
+    in C, instead of a regex that has to attempt the header at every line.
+    """
+    pos = 0
+    while True:
+        start = content.find(CURRENT_TASK_HEADER, pos)
+        if start < 0:
+            return content
+        bol = content.rfind("\n", 0, start) + 1
+        eol = content.find("\n", start)
+        if eol < 0:
+            eol = len(content)
+        if content[bol:eol].strip() == CURRENT_TASK_HEADER:
+            break
+        pos = start + 1
+
+    header_end = eol - 1 if content[bol:eol].endswith("\r") else eol
+    nl = content[header_end:eol] + "\n"
+    end = content.find("\n##", eol)
+    end = len(content) if end < 0 else end + 1
+    return f"{content[:header_end]}{nl}{task}{nl}{nl}{content[end:]}"
+
+
+# Parsed tasks.json, reused until the file's (mtime, size) changes - so an
+# edit made outside this service is picked up on the next read. Readers run
+# on the threadpool and may be serializing the cached dict at any moment, so
+# writers mutate a private copy (read_tasks_for_update) under _tasks_lock
+# and save_tasks swaps it in as the new cache only once the write succeeded.
+_tasks_cache: Optional[Dict[str, Any]] = None
+_tasks_stat: Optional[Tuple[int, int]] = None
+_tasks_lock = asyncio.Lock()
+# (tasks dict, {task_id: position in its "todo" list}), built lazily per cache generation
+_todo_index: Optional[Tuple[Dict[str, Any], Dict[str, int]]] = None
+
+
+def _stat_tasks() -> Tuple[int, int]:
+    st = os.stat(TASKS_FILE)
+    return st.st_mtime_ns, st.st_size
+
+
+def load_tasks() -> Dict[str, Any]:
+    """
+    Return parsed tasks.json, re-reading only when the file has changed.
+    The result is shared - writers must go through read_tasks_for_update.
+    """
+    global _tasks_cache, _tasks_stat
+    try:
+        stat = _stat_tasks()
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail=f"File not found: {TASKS_FILE}")
+    if _tasks_cache is not None and stat == _tasks_stat:
+        return _tasks_cache
+    _tasks_cache = read_json(TASKS_FILE)
+    _tasks_stat = stat
+    return _tasks_cache
+
+
+def read_tasks_for_update() -> Tuple[Dict[str, Any], Dict[str, int]]:
+    """
+    Copy of tasks.json for a writer to mutate, plus its todo id -> position index.
+
+    Only the top-level dict and lists are copied; a writer that edits a task
+    must replace that task dict rather than mutate the shared one.
+    """
+    global _todo_index
+    cached = load_tasks()
+    if _todo_index is None or _todo_index[0] is not cached:
+        index: Dict[str, int] = {}
+        for i, t in enumerate(cached.get("todo", [])):
+            index.setdefault(t["id"], i)
+        _todo_index = (cached, index)
+
+    data = dict(cached)
+    for key in ("todo", "completed"):
+        if key in data:
+            data[key] = list(data[key])
+    return data, _todo_index[1]
+
+
+def save_tasks(data: Dict[str, Any]):
+    """Write tasks.json, then refresh the cache to match (untouched if the write fails)"""
+    global _tasks_cache, _tasks_stat
+    write_json(TASKS_FILE, data)
+    _tasks_cache = data
+    _tasks_stat = _stat_tasks()
+
+
+# Threadpool size for the sync file endpoints (Starlette default is 40)
+THREADPOOL_TOKENS = int(os.getenv("THREADPOOL_TOKENS", "200"))
+
+
+@app.on_event("startup")
+async def configure_threadpool():
+    """Raise the anyio worker-thread limit used for sync endpoints"""
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
+
+
+@app.on_event("startup")
+async def open_http_client():
+    """Create the pooled client used for RAG re-embed triggers"""
+    global http_client
+    http_client = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_keepalive_connections=10),
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    if http_client is not None:
+        await http_client.aclose()
+
+
 # Health check
+_health_body: Tuple[str, bytes] = ("", b"")  # (timestamp, encoded body)
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy", "service": "memory", "timestamp": datetime.now().isoformat()}
+    global _health_body
+    timestamp = now_iso()
+    cached = _health_body
+    if cached[0] != timestamp:
+        body = orjson.dumps({"status": "healthy", "service": "memory", "timestamp": timestamp})
+        cached = _health_body = (timestamp, body)
+    return Response(content=cached[1], media_type="application/json")
 
 
 # Memory endpoints
 @protected.get("/memory/soul")
-async def get_soul():
+def get_soul():
     """Get SecureBot's soul/identity. Requires HMAC authentication."""
     return {"content": read_file(SOUL_FILE)}
 
 
 @protected.get("/memory/user")
-async def get_user():
+def get_user():
     """Get user profile. Requires HMAC authentication."""
     return {"content": read_file(USER_FILE)}
 
 
 @protected.get("/memory/session")
-async def get_session():
+def get_session():
     """Get current session context. Requires HMAC authentication."""
     return {"content": read_file(SESSION_FILE)}
 
 
 @protected.post("/memory/session")
 async def update_session(
-    update: SessionUpdate,
+    request: Request,
 ):
     """Update session context fields. Requires HMAC authentication."""
+    update = await parse_body(request, SessionUpdate)
     try:
         content = read_file(SESSION_FILE)
-        lines = content.split('\n')
 
         # Update specific fields if provided
         if update.last_active:
@@ -180,38 +508,28 @@ async def update_session(
             pass
 
         if update.current_task:
-            # Find and update Current Task section
-            in_task_section = False
-            new_lines = []
-            for i, line in enumerate(lines):
-                if line.strip() == "## Current Task":
-                    in_task_section = True
-                    new_lines.append(line)
-                    if i + 1 < len(lines):
-                        new_lines.append(update.current_task)
-                        # Skip old task line
-                        continue
-                elif in_task_section and line.startswith("##"):
-                    in_task_section = False
-                    new_lines.append(line)
-                elif not in_task_section:
-                    new_lines.append(line)
-
-            content = '\n'.join(new_lines)
+            # Replace the body of the Current Task section
+            content = patch_current_task(content, update.current_task)
             write_file(SESSION_FILE, content)
 
         # Trigger RAG re-embedding after memory update
-        await trigger_reembedding()
+        schedule_reembedding()
 
-        return {"status": "updated", "timestamp": datetime.now().isoformat()}
+        return {"status": "updated", "timestamp": now_iso()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @protected.get("/memory/context")
-async def get_combined_context():
+def get_combined_context():
     """Get combined context for Ollama prompts. Requires HMAC authentication."""
+    global _context_cache
     try:
+        key = tuple(_file_key(p) for p in (SOUL_FILE, USER_FILE, SESSION_FILE))
+        cached = _context_cache
+        if cached is not None and cached[0] == key:
+            return Response(content=cached[1], media_type="application/json")
+
         soul = read_file(SOUL_FILE)
         user = read_file(USER_FILE)
         session = read_file(SESSION_FILE)
@@ -228,97 +546,97 @@ async def get_combined_context():
 
 {session}
 """
-        return {"content": context}
+        body = orjson.dumps({"content": context})
+        if None not in key:
+            _context_cache = (key, body)
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # Task endpoints
 @protected.get("/tasks")
-async def get_tasks():
+def get_tasks():
     """Get all tasks. Requires HMAC authentication."""
-    return read_json(TASKS_FILE)
+    return load_tasks()
 
 
 @protected.post("/tasks")
 async def create_task(
-    task: TaskCreate,
+    request: Request,
 ):
     """Add a new task. Requires HMAC authentication."""
-    try:
-        tasks_data = read_json(TASKS_FILE)
-
-        # Generate task ID
-        todo_count = len(tasks_data.get("todo", []))
-        completed_count = len(tasks_data.get("completed", []))
-        task_id = f"task_{todo_count + completed_count + 1:03d}"
-
-        # Create task object
-        new_task = {
-            "id": task_id,
-            "title": task.title,
-            "description": task.description,
-            "priority": task.priority,
-            "created": datetime.now().isoformat(),
-            "status": "pending"
-        }
-
-        # Add to todo list
-        if "todo" not in tasks_data:
-            tasks_data["todo"] = []
-        tasks_data["todo"].append(new_task)
-
-        # Update timestamp
-        tasks_data["updated"] = datetime.now().isoformat()
-
-        # Save
-        write_json(TASKS_FILE, tasks_data)
-
-        return {"status": "created", "task": new_task}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    task = await parse_body(request, TaskCreate)
+    async with _tasks_lock:
+        try:
+            tasks_data, _ = read_tasks_for_update()
+
+            # Generate task ID
+            todo_count = len(tasks_data.get("todo", []))
+            completed_count = len(tasks_data.get("completed", []))
+            task_id = f"task_{todo_count + completed_count + 1:03d}"
+
+            # Create task object
+            new_task = {
+                "id": task_id,
+                "title": task.title,
+                "description": task.description,
+                "priority": task.priority,
+                "created": now_iso(),
+                "status": "pending"
+            }
+
+            # Add to todo list
+            if "todo" not in tasks_data:
+                tasks_data["todo"] = []
+            tasks_data["todo"].append(new_task)
+
+            # Update timestamp
+            tasks_data["updated"] = now_iso()
+
+            # Save
+            save_tasks(tasks_data)
+
+            return {"status": "created", "task": new_task}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @protected.put("/tasks/{task_id}")
 async def update_task(
     task_id: str,
-    update: TaskUpdate,
+    request: Request,
 ):
     """Update a task. Requires HMAC authentication."""
-    try:
-        tasks_data = read_json(TASKS_FILE)
-
-        # Find task in todo list
-        task_found = False
-        for task in tasks_data.get("todo", []):
-            if task["id"] == task_id:
-                # Update fields
-                if update.title:
-                    task["title"] = update.title
-                if update.description:
-                    task["description"] = update.description
-                if update.priority:
-                    task["priority"] = update.priority
-                if update.status:
-                    task["status"] = update.status
-
-                task_found = True
-                break
-
-        if not task_found:
-            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
-
-        # Update timestamp
-        tasks_data["updated"] = datetime.now().isoformat()
-
-        # Save
-        write_json(TASKS_FILE, tasks_data)
-
-        return {"status": "updated", "task_id": task_id}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    update = await parse_body(request, TaskUpdate)
+    async with _tasks_lock:
+        try:
+            tasks_data, todo_index = read_tasks_for_update()
+
+            # Find task in todo list
+            i = todo_index.get(task_id)
+            if i is None:
+                raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+
+            # Update fields (empty values leave the existing field alone)
+            changes = {k: v for k, v in update.model_dump(exclude_unset=True).items() if v}
+            todo_list = tasks_data["todo"]
+            if all(todo_list[i].get(k) == v for k, v in changes.items()):
+                # Nothing would change - skip the rewrite and timestamp bump
+                return {"status": "noop", "task_id": task_id}
+            todo_list[i] = {**todo_list[i], **changes}
+
+            # Update timestamp
+            tasks_data["updated"] = now_iso()
+
+            # Save
+            save_tasks(tasks_data)
+
+            return {"status": "updated", "task_id": task_id}
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @protected.post("/tasks/{task_id}/complete")
@@ -326,55 +644,61 @@ async def complete_task(
     task_id: str,
 ):
     """Mark task as completed and move to completed list. Requires HMAC authentication."""
-    try:
-        tasks_data = read_json(TASKS_FILE)
+    async with _tasks_lock:
+        try:
+            tasks_data, todo_index = read_tasks_for_update()
 
-        # Find and remove from todo
-        task = None
-        todo_list = tasks_data.get("todo", [])
-        for i, t in enumerate(todo_list):
-            if t["id"] == task_id:
-                task = todo_list.pop(i)
-                break
+            # Find and remove from todo
+            i = todo_index.get(task_id)
+            if i is None:
+                raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+            task = dict(tasks_data["todo"].pop(i))
 
-        if not task:
-            raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+            # Update task
+            task["status"] = "completed"
+            task["completed"] = now_iso()
 
-        # Update task
-        task["status"] = "completed"
-        task["completed"] = datetime.now().isoformat()
+            # Add to completed list
+            if "completed" not in tasks_data:
+                tasks_data["completed"] = []
+            tasks_data["completed"].append(task)
 
-        # Add to completed list
-        if "completed" not in tasks_data:
-            tasks_data["completed"] = []
-        tasks_data["completed"].append(task)
+            # Update timestamp
+            tasks_data["updated"] = now_iso()
 
-        # Update timestamp
-        tasks_data["updated"] = datetime.now().isoformat()
+            # Save
+            save_tasks(tasks_data)
 
-        # Save
-        write_json(TASKS_FILE, tasks_data)
-
-        return {"status": "completed", "task": task}
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+            return {"status": "completed", "task": task}
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 
 @protected.get("/memory/heartbeat")
-async def get_heartbeat():
-    """Get last 50 lines of heartbeat log. Requires HMAC authentication."""
+def get_heartbeat(request: Request):
+    """
+    Get last 50 lines of heartbeat log. Requires HMAC authentication.
+
+    Clients sending "Accept: application/x-ndjson" get one {"line": ...}
+    object per line as a stream; everyone else gets {"lines": [...]}.
+    """
     try:
-        with open(HEARTBEAT_LOG, 'r') as f:
-            lines = f.readlines()
-            last_lines = lines[-50:] if len(lines) > 50 else lines
-            return {"lines": [line.strip() for line in last_lines]}
+        lines = tail_lines(HEARTBEAT_LOG, 50)
     except FileNotFoundError:
-        return {"lines": []}
+        lines = []
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        def ndjson():
+            for line in lines:
+                yield orjson.dumps({"line": line.strip()}) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    return {"lines": [line.strip() for line in lines]}
+
 
 app.include_router(protected)
 
@@ -4,15 +4,24 @@ RAG Service - Retrieval Augmented Generation for SecureBot
 Embeds memory files and conversation history into ChromaDB
 Retrieves relevant context for queries without loading full memory
 """
+import asyncio
+import hashlib
+import itertools
+import json
 import os
 import sys
 import re
+import sqlite3
+import time
+import uuid
+from collections import OrderedDict, deque
 import httpx
 import chromadb
+import numpy as np
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends
+from fastapi import FastAPI, APIRouter, BackgroundTasks, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import uvicorn
@@ -22,6 +31,11 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from common.auth import verify_service_request, create_auth_dependency
 
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # token counts fall back to the ~4 chars/token estimate
+    Tokenizer = None
+
 app = FastAPI(title="SecureBot RAG Service")
 
 # Environment configuration
@@ -30,6 +44,16 @@ MEMORY_DIR = Path(os.getenv("MEMORY_DIR", "/memory"))
 CHROMA_DIR = Path(os.getenv("CHROMA_DIR", "/chroma"))
 EMBEDDING_MODEL = "nomic-embed-text"
 MAX_CONVERSATIONS = 100
+# Hub name or local tokenizer.json matching EMBEDDING_MODEL, for chunk sizing
+TOKENIZER = os.getenv("RAG_TOKENIZER", "nomic-ai/nomic-embed-text-v1")
+CHUNK_TOKENS = int(os.getenv("RAG_CHUNK_TOKENS", "200"))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("RAG_CHUNK_OVERLAP_TOKENS", "20"))
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))  # texts per /api/embed call
+CHROMA_ADD_BATCH_SIZE = int(os.getenv("CHROMA_ADD_BATCH_SIZE", "200"))  # records per collection.add
+EMBED_MAX_CONCURRENT = int(os.getenv("EMBED_MAX_CONCURRENT", "4"))  # embed requests in flight
+QUERY_EMBED_CACHE_SIZE = int(os.getenv("QUERY_EMBED_CACHE_SIZE", "1024"))
+CONTEXT_CACHE_SIZE = int(os.getenv("CONTEXT_CACHE_SIZE", "512"))
+CONTEXT_CACHE_SIMILARITY = float(os.getenv("CONTEXT_CACHE_SIMILARITY", "0.97"))  # cosine
 
 # Auth configuration
 ALLOWED_CALLERS = os.getenv("ALLOWED_CALLERS", "gateway,memory-service,heartbeat").split(",")
@@ -40,6 +64,31 @@ auth_required = create_auth_dependency(ALLOWED_CALLERS)
 # All non-health routes require HMAC auth
 protected = APIRouter(dependencies=[Depends(auth_required)])
 
+# Session summarization. The instruction is a fixed prefix with the session
+# appended after it, so Ollama can reuse the prefix's KV cache between calls.
+SUMMARY_MODEL = "phi4-mini:3.8b"
+SUMMARY_PREFIX = (
+    "Summarize this session log concisely in 200 tokens or less. "
+    "Focus on key tasks, decisions, and outcomes:"
+)
+SUMMARY_KEEP_ALIVE = os.getenv("SUMMARY_KEEP_ALIVE", "")  # e.g. "1h"; unset = Ollama default
+EMBED_KEEP_ALIVE = os.getenv("EMBED_KEEP_ALIVE", "30m")  # how long Ollama keeps the embed model loaded
+WARM_MODELS = os.getenv("RAG_WARM_MODELS", "true").lower() == "true"  # load models at startup
+
+# HNSW index parameters, applied when a collection is created (an existing
+# collection keeps the parameters it was built with). Embeddings are
+# normalized before they reach Chroma, so inner product ranks exactly like
+# cosine without re-normalizing inside the index.
+HNSW_METADATA = {
+    "hnsw:space": "ip",
+    "hnsw:M": int(os.getenv("HNSW_M", "24")),
+    "hnsw:construction_ef": int(os.getenv("HNSW_CONSTRUCTION_EF", "128")),
+    "hnsw:search_ef": int(os.getenv("HNSW_SEARCH_EF", "100")),
+}
+# The classifier examples are a couple dozen vectors searched in NumPy
+# (get_classifier_index), so their index only needs a small graph
+CLASSIFIER_HNSW_METADATA = {**HNSW_METADATA, "hnsw:M": 8, "hnsw:construction_ef": 32}
+
 # Initialize ChromaDB
 CHROMA_DIR.mkdir(parents=True, exist_ok=True)
 chroma_client = chromadb.PersistentClient(path=str(CHROMA_DIR))
@@ -47,17 +96,223 @@ chroma_client = chromadb.PersistentClient(path=str(CHROMA_DIR))
 # Collections
 memory_collection = chroma_client.get_or_create_collection(
     name="memory",
-    metadata={"hnsw:space": "cosine"}
+    metadata=HNSW_METADATA
 )
 conversation_collection = chroma_client.get_or_create_collection(
     name="conversations",
-    metadata={"hnsw:space": "cosine"}
+    metadata=HNSW_METADATA
 )
 classifier_collection = chroma_client.get_or_create_collection(
     name="classifier_examples",
-    metadata={"hnsw:space": "cosine"}
+    metadata=CLASSIFIER_HNSW_METADATA
 )
 
+# Conversation ids, oldest first, so the rolling window can evict without
+# reading the collection back. Ids embed the turn timestamp, so sorting the
+# existing ids once at startup recovers their age order.
+conversation_ids = deque(sorted(conversation_collection.get(include=[])["ids"]))
+
+
+class EmbeddingCache:
+    """
+    Persistent text -> embedding cache, stored in SQLite next to ChromaDB.
+
+    Keys are sha256(model + NUL + text), so changing EMBEDDING_MODEL just
+    misses instead of serving vectors from the old model. Vectors are stored
+    unit-normalized as float16 (1.5 KB instead of 3 KB for 768 dims); the
+    rounding error is far below what moves a cosine ranking.
+    """
+
+    DTYPE = np.float16
+
+    def __init__(self, path: Path, model: str):
+        self.model = model
+        self.hits = 0
+        self.misses = 0
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS cache (key BLOB PRIMARY KEY, vec BLOB NOT NULL)")
+        self._db.commit()
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.sha256(f"{self.model}\0{text}".encode("utf-8")).digest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """Cached embedding per text, or None where there is none"""
+        keys = [self._key(t) for t in texts]
+        found: Dict[bytes, bytes] = {}
+        for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+            part = keys[i:i + 500]
+            placeholders = ",".join("?" * len(part))
+            found.update(self._db.execute(
+                f"SELECT key, vec FROM cache WHERE key IN ({placeholders})", part
+            ).fetchall())
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return [
+            np.frombuffer(found[k], dtype=self.DTYPE).tolist() if k in found else None
+            for k in keys
+        ]
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]):
+        with self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO cache (key, vec) VALUES (?, ?)",
+                [(self._key(t), np.asarray(e, dtype=self.DTYPE).tobytes())
+                 for t, e in zip(texts, embeddings)]
+            )
+
+
+embedding_cache = EmbeddingCache(CHROMA_DIR / "embedding_cache.sqlite3", EMBEDDING_MODEL)
+
+
+class AsyncLRU:
+    """Bounded LRU for coroutine results (functools.lru_cache can't await)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_compute(self, key, factory):
+        if key in self._data:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return self._data[key]
+        self.misses += 1
+        value = await factory()
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+        return value
+
+
+# Repeated /context and /classify/examples queries skip the Ollama round-trip
+query_embedding_cache = AsyncLRU(QUERY_EMBED_CACHE_SIZE)
+
+
+class SemanticCache:
+    """
+    Approximate-match cache keyed by query embedding.
+
+    Embeddings are hashed with random-hyperplane LSH into nbits-bit
+    signatures; a lookup probes the exact bucket plus every Hamming-1
+    neighbour and accepts an entry only if its cosine similarity clears
+    the threshold. Entries are partitioned by scope so results never
+    cross tenants. Callers clear() whenever the underlying data changes.
+    """
+
+    def __init__(self, maxsize: int, threshold: float, nbits: int = 16, seed: int = 0):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.nbits = nbits
+        self._rng = np.random.default_rng(seed)
+        self._planes: Optional[np.ndarray] = None
+        self._buckets: Dict[tuple, List[int]] = {}  # {(scope, signature): [entry id]}
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # {id: (scope, sig, unit vec, value)}
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _unit_and_signature(self, embedding: List[float]):
+        v = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(v)
+        if norm:
+            v = v / norm
+        if self._planes is None or self._planes.shape[1] != v.shape[0]:
+            self.clear()
+            self._planes = self._rng.standard_normal((self.nbits, v.shape[0])).astype(np.float32)
+        sig = int.from_bytes(np.packbits((self._planes @ v) > 0).tobytes(), "big")
+        return v, sig
+
+    def get(self, scope, embedding: List[float]):
+        v, sig = self._unit_and_signature(embedding)
+        for probe in (sig, *(sig ^ (1 << b) for b in range(self.nbits))):
+            for entry_id in self._buckets.get((scope, probe), ()):
+                _, _, u, value = self._entries[entry_id]
+                if float(u @ v) >= self.threshold:
+                    self.hits += 1
+                    return value
+        self.misses += 1
+        return None
+
+    def put(self, scope, embedding: List[float], value):
+        v, sig = self._unit_and_signature(embedding)
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = (scope, sig, v, value)
+        self._buckets.setdefault((scope, sig), []).append(entry_id)
+        if len(self._entries) > self.maxsize:
+            old_id, (old_scope, old_sig, _, _) = self._entries.popitem(last=False)
+            bucket = self._buckets[(old_scope, old_sig)]
+            bucket.remove(old_id)
+            if not bucket:
+                del self._buckets[(old_scope, old_sig)]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._buckets.clear()
+        self._entries.clear()
+
+
+# /context results for near-duplicate queries; cleared on every memory or
+# conversation write so a hit never serves stale retrieval
+context_cache = SemanticCache(CONTEXT_CACHE_SIZE, CONTEXT_CACHE_SIMILARITY)
+
+
+# Shared pooled keep-alive client for Ollama calls (opened on startup).
+# Plain HTTP/1.1: Ollama serves cleartext HTTP, where httpx has no HTTP/2.
+http_client: Optional[httpx.AsyncClient] = None
+
+
+@app.on_event("startup")
+async def open_http_client():
+    global http_client
+    http_client = httpx.AsyncClient(
+        base_url=OLLAMA_HOST,
+        timeout=30.0,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
+
+
+@app.on_event("shutdown")
+async def close_http_client():
+    if http_client is not None:
+        await http_client.aclose()
+
+
+async def _warm_models():
+    """Load the embedding and summary models so the first request skips the load"""
+    # A generate request without a prompt only loads the model
+    summary_payload = {"model": SUMMARY_MODEL}
+    if SUMMARY_KEEP_ALIVE:
+        summary_payload["keep_alive"] = SUMMARY_KEEP_ALIVE
+    warmups = [
+        ("/api/embed", {"model": EMBEDDING_MODEL, "input": ["warmup"], "keep_alive": EMBED_KEEP_ALIVE}),
+        ("/api/generate", summary_payload),
+    ]
+    for path, payload in warmups:
+        try:
+            response = await http_client.post(path, json=payload, timeout=300.0)
+            response.raise_for_status()
+            print(f"Warmed {payload['model']}")
+        except Exception as e:
+            print(f"Could not warm {payload['model']}: {e}")
+
+
+_warm_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def warm_models():
+    # In the background: startup shouldn't wait on (or fail with) Ollama
+    global _warm_task
+    if WARM_MODELS:
+        _warm_task = asyncio.create_task(_warm_models())
+
 
 # Request models
 class ConversationTurn(BaseModel):
@@ -68,35 +323,274 @@ class ConversationTurn(BaseModel):
 
 
 # Helper functions
+def _load_tokenizer():
+    if Tokenizer is None:
+        return None
+    try:
+        if os.path.isfile(TOKENIZER):
+            return Tokenizer.from_file(TOKENIZER)
+        return Tokenizer.from_pretrained(TOKENIZER)
+    except Exception as e:
+        print(f"Tokenizer {TOKENIZER} unavailable, estimating tokens from length: {e}")
+        return None
+
+
+tokenizer = _load_tokenizer()
+
+
 def estimate_tokens(text: str) -> int:
     """Rough token estimation (1 token ≈ 4 characters)"""
     return len(text) // 4
 
 
+def count_tokens(text: str) -> int:
+    """Token count under the embedding model's tokenizer, or an estimate"""
+    if tokenizer is None:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+def count_tokens_many(texts: List[str]) -> List[int]:
+    """count_tokens for several texts, in one batched tokenizer call"""
+    if tokenizer is None:
+        return [estimate_tokens(t) for t in texts]
+    return [len(e.ids) for e in tokenizer.encode_batch(texts, add_special_tokens=False)]
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens, at a token boundary when a tokenizer is loaded"""
+    if tokenizer is None:
+        return text[:max_tokens * 4]
+    encoding = tokenizer.encode(text, add_special_tokens=False)
+    if len(encoding.ids) <= max_tokens:
+        return text
+    # Slice the original text at the last kept token's end offset rather
+    # than decoding ids, so whitespace and markdown come through untouched
+    return text[:encoding.offsets[max_tokens - 1][1]] if max_tokens > 0 else ""
+
+
+def join_within_tokens(parts: List[str], sep: str, max_tokens: int):
+    """
+    Join parts with sep, stopping at max_tokens. Parts are counted in one
+    batch and only the part crossing the budget is tokenized again to cut
+    it, so the full joined string is never built or encoded.
+    Returns (text, token count); truncated text ends in "...".
+    """
+    sep_tokens = count_tokens(sep)
+    kept: List[str] = []
+    total = 0
+    for part, n in zip(parts, count_tokens_many(parts)):
+        gap = sep_tokens if kept else 0
+        if total + gap + n > max_tokens:
+            room = max_tokens - total - gap
+            if room > 0:
+                kept.append(truncate_tokens(part, room))
+            text = sep.join(kept) + "..."
+            return text, count_tokens(text)
+        kept.append(part)
+        total += gap + n
+    return sep.join(kept), total
+
+
+# Document ids: process start time plus a zero-padded counter - unique,
+# sortable within a process, and no clock read per insert
+_PROC_TS = int(time.time())
+_ID_CLOCK = itertools.count()
+
+
+def next_id_suffix() -> str:
+    return f"{_PROC_TS}_{next(_ID_CLOCK):08d}"
+
+
+# "## " section headers in memory markdown
+_H2_RE = re.compile(r'\n##\s+')
+
+# Recursive split boundaries, coarsest first: paragraphs, sentences, words
+_SPLIT_LEVELS = (
+    re.compile(r"\n\s*\n"),
+    re.compile(r"(?<=[.!?])\s+"),
+    re.compile(r"\s+"),
+)
+
+
+def _split_pieces(text: str, max_tokens: int, level: int = 0,
+                  tokens: Optional[int] = None) -> List[tuple]:
+    """Break text at the coarsest boundary that gets pieces under max_tokens"""
+    if tokens is None:
+        tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return [(text, tokens)]
+    if level == len(_SPLIT_LEVELS):
+        return _hard_split(text, max_tokens)
+    # Count all parts of this level in one call; each is tokenized once
+    parts = [p.strip() for p in _SPLIT_LEVELS[level].split(text) if p.strip()]
+    pieces = []
+    for part, part_tokens in zip(parts, count_tokens_many(parts)):
+        pieces.extend(_split_pieces(part, max_tokens, level + 1, part_tokens))
+    return pieces
+
+
+def _hard_split(text: str, max_tokens: int) -> List[tuple]:
+    """Cut a single over-long word (a URL, a hash) into max_tokens pieces"""
+    pieces = []
+    while text:
+        head = truncate_tokens(text, max_tokens) or text[:1]
+        pieces.append((head, count_tokens(head)))
+        text = text[len(head):]
+    return pieces
+
+
+def split_recursive(text: str, max_tokens: int = CHUNK_TOKENS,
+                    overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> List[str]:
+    """
+    Token-aware chunking: split on paragraphs, then sentences, then words,
+    and greedily merge the pieces back into chunks of up to max_tokens.
+    Each chunk after the first starts with up to overlap_tokens of trailing
+    pieces from the one before, counted within its max_tokens.
+    """
+    chunks = []
+    if not text.strip():
+        return chunks
+    # Tokenizer counts add up across the joining spaces; the ~4 chars/token
+    # estimate doesn't, so without a tokenizer each piece is charged one extra
+    # token to keep the joined chunk's estimate under max_tokens too
+    slack = 0 if tokenizer is not None else 1
+    current: List[tuple] = []
+    current_tokens = 0
+    for piece, tokens in _split_pieces(text.strip(), max_tokens):
+        cost = tokens + slack
+        if current and current_tokens + cost > max_tokens:
+            chunks.append(" ".join(p for p, _ in current))
+            # Carry the tail of this chunk into the next as overlap
+            carried: List[tuple] = []
+            carried_tokens = 0
+            for p, c in reversed(current):
+                if carried_tokens + c > overlap_tokens:
+                    break
+                carried.insert(0, (p, c))
+                carried_tokens += c
+            # The overlap shares the next chunk's budget with the new piece
+            while carried and carried_tokens + cost > max_tokens:
+                carried_tokens -= carried.pop(0)[1]
+            current, current_tokens = carried, carried_tokens
+        current.append((piece, cost))
+        current_tokens += cost
+    if current:
+        chunks.append(" ".join(p for p, _ in current))
+    return chunks
+
+
+def normalize_embeddings(embeddings: List[List[float]]) -> List[List[float]]:
+    """
+    Scale vectors to unit length in one NumPy pass. Every stored and query
+    vector is normalized, which lets collections use inner-product space.
+    """
+    m = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    m /= np.maximum(norms, 1e-12)
+    return m.tolist()
+
+
 async def get_ollama_embedding(text: str) -> List[float]:
-    """Get embedding from Ollama"""
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            response = await client.post(
-                f"{OLLAMA_HOST}/api/embeddings",
-                json={"model": EMBEDDING_MODEL, "prompt": text}
-            )
+    """Get (unit-length) embedding from Ollama"""
+    try:
+        response = await http_client.post(
+            "/api/embeddings",
+            json={"model": EMBEDDING_MODEL, "prompt": text, "keep_alive": EMBED_KEEP_ALIVE}
+        )
+        response.raise_for_status()
+        return normalize_embeddings([response.json()["embedding"]])[0]
+    except Exception as e:
+        print(f"Embedding error: {e}")
+        raise HTTPException(status_code=500, detail=f"Embedding failed: {str(e)}")
+
+
+def query_fingerprint(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used as its cache key"""
+    return " ".join(query.casefold().split())
+
+
+async def get_query_embedding(query: str) -> List[float]:
+    """
+    Embedding for a search query, memoized in query_embedding_cache.
+    Queries differing only in case or spacing share one entry.
+    """
+    return await query_embedding_cache.get_or_compute(
+        (EMBEDDING_MODEL, query_fingerprint(query)), lambda: get_ollama_embedding(query)
+    )
+
+
+# Cleared if Ollama predates the batch /api/embed endpoint (0.2.0)
+_embed_batch_supported = True
+# Bounds concurrent /api/embeddings requests so Ollama isn't flooded
+_embed_semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENT)
+# Bounds concurrent batch embeds during a memory rebuild (separate from the
+# per-text bound, which a batch falling back to /api/embeddings needs)
+_embed_batch_semaphore = asyncio.Semaphore(EMBED_MAX_CONCURRENT)
+
+
+async def _embed_one(text: str) -> List[float]:
+    async with _embed_semaphore:
+        return await get_ollama_embedding(text)
+
+
+def _is_missing_route(response: httpx.Response) -> bool:
+    """
+    A 404 for an unknown endpoint (plain "404 page not found"), as opposed
+    to Ollama's JSON {"error": ...} 404 for a model that isn't pulled yet
+    """
+    if response.status_code != 404:
+        return False
+    try:
+        return "error" not in response.json()
+    except ValueError:
+        return True
+
+
+async def get_ollama_embeddings_batch(texts: List[str]) -> List[List[float]]:
+    """
+    Get embeddings for several texts in one Ollama /api/embed call.
+    Falls back to one /api/embeddings call per text on older Ollama.
+    """
+    global _embed_batch_supported
+    if _embed_batch_supported:
+        response = await http_client.post(
+            "/api/embed",
+            json={"model": EMBEDDING_MODEL, "input": texts, "keep_alive": EMBED_KEEP_ALIVE},
+            timeout=120.0
+        )
+        if not _is_missing_route(response):
             response.raise_for_status()
-            return response.json()["embedding"]
-        except Exception as e:
-            print(f"Embedding error: {e}")
-            raise HTTPException(status_code=500, detail=f"Embedding failed: {str(e)}")
+            return normalize_embeddings(response.json()["embeddings"])
+        print("Ollama has no /api/embed - falling back to per-text /api/embeddings")
+        _embed_batch_supported = False
+
+    return list(await asyncio.gather(*(_embed_one(text) for text in texts)))
+
+
+async def get_embeddings_cached(texts: List[str]) -> List[List[float]]:
+    """Batch embeddings, asking Ollama only for texts not in embedding_cache"""
+    embeddings = embedding_cache.get_many(texts)
+    missing = [i for i, e in enumerate(embeddings) if e is None]
+    if missing:
+        fresh = await get_ollama_embeddings_batch([texts[i] for i in missing])
+        embedding_cache.put_many([texts[i] for i in missing], fresh)
+        for i, e in zip(missing, fresh):
+            embeddings[i] = e
+    return embeddings
 
 
-def chunk_markdown(content: str, source: str, max_tokens: int = 300) -> List[Dict[str, Any]]:
+def chunk_markdown(content: str, source: str, max_tokens: int = CHUNK_TOKENS,
+                   timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Chunk markdown by headers with overlap
-    Returns list of {text, metadata}
+    Returns list of {text, metadata}; every chunk shares one ingest timestamp
     """
     chunks = []
+    timestamp = timestamp or datetime.now().isoformat()
 
     # Split by ## headers
-    sections = re.split(r'\n##\s+', content)
+    sections = _H2_RE.split(content)
 
     for i, section in enumerate(sections):
         if not section.strip():
@@ -107,74 +601,140 @@ def chunk_markdown(content: str, source: str, max_tokens: int = 300) -> List[Dic
         title = lines[0].strip('#').strip() if lines else "Intro"
         body = lines[1] if len(lines) > 1 else section
 
-        # Split large sections into smaller chunks
-        words = body.split()
-        chunk_size = max_tokens * 4  # ~4 chars per token
-        overlap = 50 * 4  # 50 token overlap
-
-        start = 0
-        chunk_num = 0
-        while start < len(' '.join(words)):
-            chunk_text = ' '.join(words[start:start + chunk_size])
-
-            if not chunk_text.strip():
-                break
-
+        # Split large sections into token-bounded chunks
+        for chunk_num, chunk_text in enumerate(split_recursive(body, max_tokens)):
             chunks.append({
                 "text": f"## {title}\n{chunk_text}",
                 "metadata": {
                     "source": source,
                     "section": title,
                     "chunk": chunk_num,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": timestamp
                 }
             })
 
-            chunk_num += 1
-            start += chunk_size - overlap
+    return chunks
 
-            if start + overlap >= len(' '.join(words)):
-                break
 
-    return chunks
+MEMORY_FILES = ["soul.md", "user.md", "session.md"]
+# {filename: sha256 of the content currently embedded}
+MEMORY_HASHES_FILE = CHROMA_DIR / "memory_hashes.json"
+
+
+def _load_memory_hashes() -> Dict[str, str]:
+    try:
+        return json.loads(MEMORY_HASHES_FILE.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
 
+def _save_memory_hashes(hashes: Dict[str, str]):
+    tmp = MEMORY_HASHES_FILE.with_suffix(".tmp")
+    tmp.write_text(json.dumps(hashes, indent=2), encoding="utf-8")
+    os.replace(tmp, MEMORY_HASHES_FILE)
 
-async def embed_memory_files():
-    """Embed all memory files into ChromaDB"""
-    memory_files = ["soul.md", "user.md", "session.md"]
-    total_chunks = 0
 
-    # Clear existing memory collection
-    chroma_client.delete_collection("memory")
-    global memory_collection
-    memory_collection = chroma_client.create_collection(
-        name="memory",
-        metadata={"hnsw:space": "cosine"}
+def _read_memory_file(filepath: Path) -> Optional[bytes]:
+    try:
+        return filepath.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def _has_memory_chunks(source: str) -> bool:
+    """Whether any chunk of source is stored (blocking; run in a thread)"""
+    return bool(memory_collection.get(where={"source": source}, limit=1, include=[])["ids"])
+
+
+def _replace_memory_chunks(sources: List[str], embeddings, documents, metadatas, ids):
+    """Swap the stored chunks of sources for new ones (blocking; run in a thread)"""
+    for source in sources:
+        memory_collection.delete(where={"source": source})
+    # Bounded add() calls keep each Chroma transaction a manageable size
+    for i in range(0, len(ids), CHROMA_ADD_BATCH_SIZE):
+        memory_collection.add(
+            embeddings=embeddings[i:i + CHROMA_ADD_BATCH_SIZE],
+            documents=documents[i:i + CHROMA_ADD_BATCH_SIZE],
+            metadatas=metadatas[i:i + CHROMA_ADD_BATCH_SIZE],
+            ids=ids[i:i + CHROMA_ADD_BATCH_SIZE]
+        )
+
+
+async def embed_memory_files(files: Optional[List[str]] = None):
+    """
+    Embed memory files into ChromaDB.
+    Only files whose content changed since the last run are re-embedded;
+    their old chunks are deleted by source instead of dropping the collection.
+    Pass files to check just those (default: all of MEMORY_FILES).
+    """
+    hashes = _load_memory_hashes()
+    filenames = MEMORY_FILES if files is None else [f for f in MEMORY_FILES if f in files]
+
+    # Read the files concurrently off the event loop, so a large session.md
+    # doesn't stall in-flight /context and /health requests
+    contents = await asyncio.gather(
+        *(asyncio.to_thread(_read_memory_file, MEMORY_DIR / filename) for filename in filenames)
     )
 
-    for filename in memory_files:
-        filepath = MEMORY_DIR / filename
-        if not filepath.exists():
+    # Collect chunks from every changed file, then embed them in batches
+    ingest_time = datetime.now()
+    all_chunks = []
+    changed: Dict[str, str] = {}
+    removed: List[str] = []
+    for filename, raw in zip(filenames, contents):
+        if raw is None:
             print(f"Skipping {filename} - not found")
+            if hashes.pop(filename, None) is not None:
+                removed.append(filename)
             continue
 
-        content = filepath.read_text(encoding="utf-8")
-        chunks = chunk_markdown(content, filename, max_tokens=300)
+        digest = hashlib.sha256(raw).hexdigest()
+        if hashes.get(filename) == digest and await asyncio.to_thread(_has_memory_chunks, filename):
+            continue
+
+        changed[filename] = digest
+        all_chunks.extend(chunk_markdown(raw.decode("utf-8"), filename, timestamp=ingest_time.isoformat()))
+
+    # chunk numbers restart per section, so the id counter keeps ids unique
+    ids = [f"{c['metadata']['source']}_{c['metadata']['chunk']}_{next_id_suffix()}" for c in all_chunks]
+
+    # Embed the batches concurrently (bounded), then accumulate in order
+    async def embed_batch(batch):
+        async with _embed_batch_semaphore:
+            return await get_embeddings_cached([c["text"] for c in batch])
+
+    starts = range(0, len(all_chunks), EMBED_BATCH_SIZE)
+    results = await asyncio.gather(
+        *(embed_batch(all_chunks[i:i + EMBED_BATCH_SIZE]) for i in starts),
+        return_exceptions=True
+    )
+
+    embeddings, documents, metadatas, chunk_ids = [], [], [], []
+    failed_sources = set()
+    for i, result in zip(starts, results):
+        batch = all_chunks[i:i + EMBED_BATCH_SIZE]
+        if isinstance(result, BaseException):
+            print(f"Failed to embed batch of {len(batch)} memory chunks: {result}")
+            failed_sources.update(c["metadata"]["source"] for c in batch)
+            continue
+        embeddings.extend(result)
+        documents.extend(c["text"] for c in batch)
+        metadatas.extend(c["metadata"] for c in batch)
+        chunk_ids.extend(ids[i:i + EMBED_BATCH_SIZE])
 
-        for chunk in chunks:
-            try:
-                embedding = await get_ollama_embedding(chunk["text"])
+    await asyncio.to_thread(
+        _replace_memory_chunks, [*changed, *removed], embeddings, documents, metadatas, chunk_ids
+    )
+    total_chunks = len(chunk_ids)
 
-                memory_collection.add(
-                    embeddings=[embedding],
-                    documents=[chunk["text"]],
-                    metadatas=[chunk["metadata"]],
-                    ids=[f"{filename}_{chunk['metadata']['chunk']}_{datetime.now().timestamp()}"]
-                )
-                total_chunks += 1
-            except Exception as e:
-                print(f"Failed to embed chunk from {filename}: {e}")
-                continue
+    # A file with a failed batch keeps no hash, so the next run retries it whole
+    for filename, digest in changed.items():
+        if filename in failed_sources:
+            hashes.pop(filename, None)
+        else:
+            hashes[filename] = digest
+    _save_memory_hashes(hashes)
+    context_cache.clear()
 
     return total_chunks
 
@@ -185,9 +745,11 @@ async def embed_memory_files():
 async def health_check():
     """Service health check with ChromaDB stats"""
     try:
-        memory_count = memory_collection.count()
-        conversation_count = conversation_collection.count()
-        classifier_count = classifier_collection.count()
+        memory_count, conversation_count, classifier_count = await asyncio.gather(
+            asyncio.to_thread(memory_collection.count),
+            asyncio.to_thread(conversation_collection.count),
+            asyncio.to_thread(classifier_collection.count),
+        )
 
         return {
             "status": "healthy",
@@ -195,7 +757,18 @@ async def health_check():
             "memory_chunks": memory_count,
             "conversations": conversation_count,
             "classifier_examples": classifier_count,
-            "chroma_path": str(CHROMA_DIR)
+            "chroma_path": str(CHROMA_DIR),
+            "embedding_cache": {
+                "query_hits": query_embedding_cache.hits,
+                "query_misses": query_embedding_cache.misses,
+                "disk_hits": embedding_cache.hits,
+                "disk_misses": embedding_cache.misses
+            },
+            "context_cache": {
+                "entries": len(context_cache),
+                "hits": context_cache.hits,
+                "misses": context_cache.misses
+            }
         }
     except Exception as e:
         return JSONResponse(
@@ -236,27 +809,59 @@ async def embed_conversation(
         conv_metadata = {"timestamp": turn.timestamp}
         if turn.user_id:
             conv_metadata["user_id"] = turn.user_id
-        conversation_collection.add(
+        conv_id = f"conv_{turn.timestamp}_{next_id_suffix()}"
+        # Chroma calls block (SQLite + HNSW); keep them off the event loop
+        await asyncio.to_thread(
+            conversation_collection.add,
             embeddings=[embedding],
             documents=[combined],
             metadatas=[conv_metadata],
-            ids=[f"conv_{turn.timestamp}_{datetime.now().timestamp()}"]
+            ids=[conv_id]
         )
+        conversation_ids.append(conv_id)
+        context_cache.clear()
 
         # Maintain rolling window (keep last 100 conversations)
-        count = conversation_collection.count()
-        if count > MAX_CONVERSATIONS:
-            # Get all IDs sorted by timestamp
-            results = conversation_collection.get()
-            if results and results['ids']:
-                ids_to_delete = sorted(results['ids'])[:count - MAX_CONVERSATIONS]
-                conversation_collection.delete(ids=ids_to_delete)
+        if len(conversation_ids) > MAX_CONVERSATIONS:
+            # Drop ids from the deque only once Chroma has deleted them, so a
+            # failed delete is retried on the next insert instead of leaking
+            ids_to_delete = list(itertools.islice(conversation_ids, len(conversation_ids) - MAX_CONVERSATIONS))
+            await asyncio.to_thread(conversation_collection.delete, ids=ids_to_delete)
+            # A concurrent insert may have popped some of them already
+            deleted = set(ids_to_delete)
+            while conversation_ids and conversation_ids[0] in deleted:
+                conversation_ids.popleft()
 
         return {"status": "ok"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _query_conversations(query_embedding: List[float], user_id: Optional[str]):
+    """Top conversation turn for a query, filtered by user_id for tenant isolation"""
+    conv_count = conversation_collection.count()
+    if conv_count == 0:
+        return None
+    try:
+        query_kwargs = dict(
+            query_embeddings=[query_embedding],
+            n_results=max(1, min(1, conv_count))
+        )
+        if user_id:
+            query_kwargs["where"] = {"user_id": user_id}
+        return conversation_collection.query(**query_kwargs)
+    except Exception as e:
+        # Graceful fallback if where-filter fails (older docs without user_id)
+        print(f"Conversation filter error (falling back to unfiltered): {e}")
+        try:
+            return conversation_collection.query(
+                query_embeddings=[query_embedding],
+                n_results=max(1, min(1, conv_count))
+            )
+        except Exception:
+            return None
+
+
 @protected.get("/context")
 async def get_context(
     query: str,
@@ -269,39 +874,33 @@ async def get_context(
     Requires HMAC authentication.
     """
     try:
-        # Get query embedding
-        query_embedding = await get_ollama_embedding(query)
+        # Nothing indexed yet (fresh container) - skip the Ollama round-trip.
+        # conversation_ids mirrors the conversations collection, so only the
+        # memory count needs a query.
+        memory_count = await asyncio.to_thread(memory_collection.count)
+        if memory_count == 0 and not conversation_ids:
+            return {"context": "", "tokens_estimate": 0, "sources": []}
 
-        # Search memory collection (top 2 results) - shared, no user filter
-        memory_results = memory_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=max(1, min(2, memory_collection.count()))
+        # Get query embedding
+        query_embedding = await get_query_embedding(query)
+
+        # Near-duplicate of a recent query against unchanged collections?
+        cache_scope = (user_id, max_tokens)
+        cached = context_cache.get(cache_scope, query_embedding)
+        if cached is not None:
+            return cached
+
+        # Both HNSW searches are blocking calls; run them side by side off the
+        # event loop. Memory (top 2) is shared, conversations (top 1) per user.
+        memory_results, conversation_results = await asyncio.gather(
+            asyncio.to_thread(
+                memory_collection.query,
+                query_embeddings=[query_embedding],
+                n_results=max(1, min(2, memory_count))
+            ),
+            asyncio.to_thread(_query_conversations, query_embedding, user_id)
         )
 
-
-        # Search conversations - filter by user_id for tenant isolation
-        conversation_results = None
-        conv_count = conversation_collection.count()
-        if conv_count > 0:
-            try:
-                query_kwargs = dict(
-                    query_embeddings=[query_embedding],
-                    n_results=max(1, min(1, conv_count))
-                )
-                if user_id:
-                    query_kwargs["where"] = {"user_id": user_id}
-                conversation_results = conversation_collection.query(**query_kwargs)
-            except Exception as e:
-                # Graceful fallback if where-filter fails (older docs without user_id)
-                print(f"Conversation filter error (falling back to unfiltered): {e}")
-                try:
-                    conversation_results = conversation_collection.query(
-                        query_embeddings=[query_embedding],
-                        n_results=max(1, min(1, conv_count))
-                    )
-                except Exception:
-                    conversation_results = None
-
         # Build context string
         context_parts = []
         sources = []
@@ -316,19 +915,16 @@ async def get_context(
                 context_parts.append(f"[Past conversation]\n{doc}")
                 sources.append("conversation_history")
 
-        context = "\n\n---\n\n".join(context_parts)
-
-        # Truncate if exceeds max_tokens
-        if estimate_tokens(context) > max_tokens:
-            # Trim to max_tokens
-            char_limit = max_tokens * 4
-            context = context[:char_limit] + "..."
+        # Join up to max_tokens, truncating the part that crosses it
+        context, tokens = join_within_tokens(context_parts, "\n\n---\n\n", max_tokens)
 
-        return {
+        result = {
             "context": context,
-            "tokens_estimate": estimate_tokens(context),
-            "sources": list(set(sources))
+            "tokens_estimate": tokens,
+            "sources": list(dict.fromkeys(sources))
         }
+        context_cache.put(cache_scope, query_embedding, result)
+        return result
     except Exception as e:
         # Graceful fallback - return empty context
         print(f"Context retrieval error: {e}")
@@ -340,6 +936,25 @@ async def get_context(
         }
 
 
+# In-process copy of the classifier examples. The set is small and only
+# changes on /classify/seed, so an exact NumPy search replaces the Chroma
+# query per request. Loaded on first use; None means reload.
+_classifier_index: Optional[tuple] = None
+
+
+def get_classifier_index():
+    """(unit-vector matrix, metadatas) for every stored classifier example"""
+    global _classifier_index
+    if _classifier_index is None:
+        data = classifier_collection.get(include=["embeddings", "metadatas"])
+        if len(data["ids"]):
+            matrix = np.asarray(normalize_embeddings(data["embeddings"]), dtype=np.float32)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        _classifier_index = (matrix, list(data["metadatas"] or []))
+    return _classifier_index
+
+
 @protected.get("/classify/examples")
 async def get_classifier_examples(
     query: str,
@@ -357,30 +972,32 @@ async def get_classifier_examples(
         {"examples": [{"query": "...", "label": "ACTION|KNOWLEDGE|SKILL_NEEDED|CURRENT", "reason": "...", "chain_of_thought": "..."}]}
     """
     try:
-        # Check if collection is empty
-        if classifier_collection.count() == 0:
+        matrix, metadatas = await asyncio.to_thread(get_classifier_index)
+        if not metadatas:
             print("Classifier examples collection is empty")
             return {"examples": []}
 
         # Get embedding for query
-        query_embedding = await get_ollama_embedding(query)
+        query_embedding = await get_query_embedding(query)
 
-        # Search for k nearest neighbors
-        results = classifier_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(k, classifier_collection.count())
-        )
+        # Exact k nearest neighbors: one matrix-vector product over unit vectors
+        k = min(k, len(metadatas))
+        if k <= 0:
+            return {"examples": []}
+        scores = matrix @ np.asarray(query_embedding, dtype=np.float32)
+        top = np.argpartition(scores, -k)[-k:]
+        top = top[np.argsort(scores[top])[::-1]]
 
         # Format results
         examples = []
-        if results and results['metadatas']:
-            for metadata in results['metadatas'][0]:
-                examples.append({
-                    "query": metadata['query'],
-                    "label": metadata['label'],
-                    "reason": metadata['reason'],
-                    "chain_of_thought": metadata.get('chain_of_thought', '')
-                })
+        for i in top:
+            metadata = metadatas[i]
+            examples.append({
+                "query": metadata['query'],
+                "label": metadata['label'],
+                "reason": metadata['reason'],
+                "chain_of_thought": metadata.get('chain_of_thought', '')
+            })
 
         return {"examples": examples}
 
@@ -390,6 +1007,201 @@ async def get_classifier_examples(
         return {"examples": []}
 
 
+# Classifier seed examples - 6 per class (24 total), with chain_of_thought
+CLASSIFIER_SEED_EXAMPLES = [
+    # KNOWLEDGE examples (6)
+    {
+        "query": "Design a scalable microservices architecture for e-commerce. Consider trade-offs between consistency and availability.",
+        "label": "KNOWLEDGE",
+        "reason": "Asks for architectural guidance and trade-off analysis, not a deliverable artifact.",
+        "chain_of_thought": "The user asks to 'design' with 'consider trade-offs' — this is analytical guidance, not a deliverable. No code or file is requested. → KNOWLEDGE"
+    },
+    {
+        "query": "What are the pros and cons of using Redis vs Memcached for session storage?",
+        "label": "KNOWLEDGE",
+        "reason": "Comparison of technologies, no artifact requested.",
+        "chain_of_thought": "'Pros and cons' signals comparative analysis. No action verb requesting a specific artifact. → KNOWLEDGE"
+    },
+    {
+        "query": "Explain how Python list comprehensions work with nested loops.",
+        "label": "KNOWLEDGE",
+        "reason": "Explanation of a concept.",
+        "chain_of_thought": "'Explain how' is a canonical knowledge signal. User wants understanding, not code. → KNOWLEDGE"
+    },
+    {
+        "query": "How does consistent hashing work and when should I use it?",
+        "label": "KNOWLEDGE",
+        "reason": "Conceptual explanation with usage guidance.",
+        "chain_of_thought": "'How does X work' + 'when should I use it' — both request explanation and guidance. No artifact. → KNOWLEDGE"
+    },
+    {
+        "query": "What are best practices for securing a FastAPI application?",
+        "label": "KNOWLEDGE",
+        "reason": "Best practices discussion, no code artifact requested.",
+        "chain_of_thought": "'Best practices' is a knowledge signal. User wants a list of recommendations, not code. → KNOWLEDGE"
+    },
+    {
+        "query": "What are the trade-offs between monolith and microservices for a startup?",
+        "label": "KNOWLEDGE",
+        "reason": "Architectural trade-off analysis.",
+        "chain_of_thought": "'Trade-offs between' is a strong analytical signal. No implementation artifact requested. → KNOWLEDGE"
+    },
+
+    # ACTION examples (6)
+    {
+        "query": "Reverse the string hello world",
+        "label": "ACTION",
+        "reason": "Specific transformation of specific input requested.",
+        "chain_of_thought": "Direct imperative verb 'reverse' on a specific input. An executable result is expected immediately. No skill gap. → ACTION"
+    },
+    {
+        "query": "Write a bash script to monitor disk usage and alert when above 90%",
+        "label": "ACTION",
+        "reason": "Specific script artifact requested.",
+        "chain_of_thought": "'Write a bash script' is an unambiguous artifact request. The output is a specific file. Existing bash skill available. → ACTION"
+    },
+    {
+        "query": "Build a Python function that parses a CSV and returns a dict",
+        "label": "ACTION",
+        "reason": "Specific code artifact to produce.",
+        "chain_of_thought": "'Build a Python function' requests a concrete code artifact. Standard capability, no new skill needed. → ACTION"
+    },
+    {
+        "query": "Generate an Ansible playbook to install nginx on Ubuntu",
+        "label": "ACTION",
+        "reason": "Specific playbook artifact to produce.",
+        "chain_of_thought": "'Generate an Ansible playbook' — clear artifact request. Standard devops task within existing capabilities. → ACTION"
+    },
+    {
+        "query": "Convert this JSON to YAML: {name: roland, role: admin}",
+        "label": "ACTION",
+        "reason": "Specific data transformation with given input.",
+        "chain_of_thought": "Imperative 'convert' with specific input provided. Immediate transformation, no new skill required. → ACTION"
+    },
+    {
+        "query": "Implement a binary search function in Python",
+        "label": "ACTION",
+        "reason": "Specific code artifact, not a conceptual explanation.",
+        "chain_of_thought": "'Implement' signals code production. 'Binary search in Python' is a standard algorithm — within existing capabilities. → ACTION"
+    },
+
+    # SKILL_NEEDED examples (6)
+    {
+        "query": "Generate a PDF report from this CSV data",
+        "label": "SKILL_NEEDED",
+        "reason": "No PDF generation skill exists.",
+        "chain_of_thought": "User wants a PDF artifact from CSV. Checking skills index: no pdf-generation skill found. A new skill must be created before execution. → SKILL_NEEDED"
+    },
+    {
+        "query": "Send me a Telegram message when disk usage exceeds 90%",
+        "label": "SKILL_NEEDED",
+        "reason": "No Telegram skill exists.",
+        "chain_of_thought": "Requires Telegram bot integration. Checking skills index: no telegram-notify skill found. This is a new capability that needs a skill. → SKILL_NEEDED"
+    },
+    {
+        "query": "Create a Docker Compose file for a Python app with PostgreSQL and Redis",
+        "label": "SKILL_NEEDED",
+        "reason": "No docker-compose skill exists.",
+        "chain_of_thought": "Artifact request for a multi-service Docker Compose. Skills index: no docker-compose-generator skill found. Queuing skill creation. → SKILL_NEEDED"
+    },
+    {
+        "query": "Monitor my SecureBot services and send a daily email summary",
+        "label": "SKILL_NEEDED",
+        "reason": "No email skill exists.",
+        "chain_of_thought": "Requires email integration and service monitoring. Skills index: no email-sender or service-monitor skill found. → SKILL_NEEDED"
+    },
+    {
+        "query": "Convert this markdown file to a Word document",
+        "label": "SKILL_NEEDED",
+        "reason": "No markdown-to-docx skill exists.",
+        "chain_of_thought": "markdown→docx conversion requires pandoc or python-docx integration. Skills index: no markdown-to-docx skill. → SKILL_NEEDED"
+    },
+    {
+        "query": "Set up a Python virtual environment and install dependencies from requirements.txt",
+        "label": "SKILL_NEEDED",
+        "reason": "No python-env-setup skill exists.",
+        "chain_of_thought": "Shell automation for venv + pip install. Skills index: no python-env-setup skill found. Queuing for creation. → SKILL_NEEDED"
+    },
+
+    # CURRENT examples (6)
+    {
+        "query": "What are the latest AI developments in 2026?",
+        "label": "CURRENT",
+        "reason": "Latest and 2026 signal recency beyond 2023 training.",
+        "chain_of_thought": "'Latest' + '2026' both signal real-time information beyond training cutoff. Cannot answer from static knowledge. → CURRENT"
+    },
+    {
+        "query": "What is the current price of Bitcoin?",
+        "label": "CURRENT",
+        "reason": "Prices change in real-time.",
+        "chain_of_thought": "'Current price' is inherently real-time data. Bitcoin price changes every second. Static training data is useless here. → CURRENT"
+    },
+    {
+        "query": "Who won the Super Bowl this year?",
+        "label": "CURRENT",
+        "reason": "Sports results are time-sensitive.",
+        "chain_of_thought": "'This year' signals recency. Sports results are not in training data for current season. Web search required. → CURRENT"
+    },
+    {
+        "query": "What are the latest Ubuntu 24.04 security updates?",
+        "label": "CURRENT",
+        "reason": "Security updates released continuously.",
+        "chain_of_thought": "'Latest' + 'security updates' — CVEs and patches are released daily. Training data is stale for this. → CURRENT"
+    },
+    {
+        "query": "Is there a new version of phi4-mini available?",
+        "label": "CURRENT",
+        "reason": "Model releases happen after training cutoff.",
+        "chain_of_thought": "'New version' of a model released post-cutoff. Model release information requires web search. → CURRENT"
+    },
+    {
+        "query": "What is the current status of the Anthropic API rate limits?",
+        "label": "CURRENT",
+        "reason": "API policies change frequently.",
+        "chain_of_thought": "'Current status' of API policies — these change frequently. Must query live documentation or search. → CURRENT"
+    },
+]
+
+# Precomputed seed embeddings, generated offline with
+#   python rag_service.py --export-seed-embeddings seed_classifier_embeddings.npz
+SEED_EMBEDDINGS_FILE = Path(os.getenv(
+    "RAG_SEED_EMBEDDINGS", str(Path(__file__).with_name("seed_classifier_embeddings.npz"))
+))
+
+
+def _seed_embeddings_key() -> str:
+    """Identifies the model and seed queries a precomputed file was built from"""
+    queries = "\0".join(e["query"] for e in CLASSIFIER_SEED_EXAMPLES)
+    return hashlib.sha256(f"{EMBEDDING_MODEL}\0{queries}".encode("utf-8")).hexdigest()
+
+
+def load_seed_embeddings() -> Optional[List[List[float]]]:
+    """Precomputed seed embeddings, or None if absent or built from other examples"""
+    if not SEED_EMBEDDINGS_FILE.exists():
+        return None
+    try:
+        with np.load(SEED_EMBEDDINGS_FILE) as data:
+            if str(data["key"]) != _seed_embeddings_key():
+                print(f"{SEED_EMBEDDINGS_FILE} is stale - embedding seed examples via Ollama")
+                return None
+            return normalize_embeddings(data["embeddings"].astype(np.float32))
+    except Exception as e:
+        print(f"Could not load {SEED_EMBEDDINGS_FILE}: {e}")
+        return None
+
+
+async def export_seed_embeddings(path: Path):
+    """Embed the seed examples once and write them for load_seed_embeddings"""
+    await open_http_client()
+    try:
+        embeddings = await get_ollama_embeddings_batch([e["query"] for e in CLASSIFIER_SEED_EXAMPLES])
+    finally:
+        await close_http_client()
+    np.savez(path, key=np.array(_seed_embeddings_key()),
+             embeddings=np.asarray(embeddings, dtype=np.float16))
+    print(f"Wrote {len(embeddings)} seed embeddings to {path}")
+
+
 @protected.post("/classify/seed")
 async def seed_classifier_examples():
     """
@@ -400,190 +1212,34 @@ async def seed_classifier_examples():
     Returns:
         {"status": "ok", "seeded": N}
     """
+    global _classifier_index
     try:
         # Check if already seeded
-        if classifier_collection.count() > 0:
+        if await asyncio.to_thread(classifier_collection.count) > 0:
             print("Classifier examples already seeded")
             return {"status": "ok", "seeded": 0, "message": "Already seeded"}
 
-        # Define seed examples - 6 per class (24 total), with chain_of_thought
-        seed_examples = [
-            # KNOWLEDGE examples (6)
-            {
-                "query": "Design a scalable microservices architecture for e-commerce. Consider trade-offs between consistency and availability.",
-                "label": "KNOWLEDGE",
-                "reason": "Asks for architectural guidance and trade-off analysis, not a deliverable artifact.",
-                "chain_of_thought": "The user asks to 'design' with 'consider trade-offs' — this is analytical guidance, not a deliverable. No code or file is requested. → KNOWLEDGE"
-            },
-            {
-                "query": "What are the pros and cons of using Redis vs Memcached for session storage?",
-                "label": "KNOWLEDGE",
-                "reason": "Comparison of technologies, no artifact requested.",
-                "chain_of_thought": "'Pros and cons' signals comparative analysis. No action verb requesting a specific artifact. → KNOWLEDGE"
-            },
-            {
-                "query": "Explain how Python list comprehensions work with nested loops.",
-                "label": "KNOWLEDGE",
-                "reason": "Explanation of a concept.",
-                "chain_of_thought": "'Explain how' is a canonical knowledge signal. User wants understanding, not code. → KNOWLEDGE"
-            },
-            {
-                "query": "How does consistent hashing work and when should I use it?",
-                "label": "KNOWLEDGE",
-                "reason": "Conceptual explanation with usage guidance.",
-                "chain_of_thought": "'How does X work' + 'when should I use it' — both request explanation and guidance. No artifact. → KNOWLEDGE"
-            },
-            {
-                "query": "What are best practices for securing a FastAPI application?",
-                "label": "KNOWLEDGE",
-                "reason": "Best practices discussion, no code artifact requested.",
-                "chain_of_thought": "'Best practices' is a knowledge signal. User wants a list of recommendations, not code. → KNOWLEDGE"
-            },
-            {
-                "query": "What are the trade-offs between monolith and microservices for a startup?",
-                "label": "KNOWLEDGE",
-                "reason": "Architectural trade-off analysis.",
-                "chain_of_thought": "'Trade-offs between' is a strong analytical signal. No implementation artifact requested. → KNOWLEDGE"
-            },
-
-            # ACTION examples (6)
-            {
-                "query": "Reverse the string hello world",
-                "label": "ACTION",
-                "reason": "Specific transformation of specific input requested.",
-                "chain_of_thought": "Direct imperative verb 'reverse' on a specific input. An executable result is expected immediately. No skill gap. → ACTION"
-            },
-            {
-                "query": "Write a bash script to monitor disk usage and alert when above 90%",
-                "label": "ACTION",
-                "reason": "Specific script artifact requested.",
-                "chain_of_thought": "'Write a bash script' is an unambiguous artifact request. The output is a specific file. Existing bash skill available. → ACTION"
-            },
-            {
-                "query": "Build a Python function that parses a CSV and returns a dict",
-                "label": "ACTION",
-                "reason": "Specific code artifact to produce.",
-                "chain_of_thought": "'Build a Python function' requests a concrete code artifact. Standard capability, no new skill needed. → ACTION"
-            },
-            {
-                "query": "Generate an Ansible playbook to install nginx on Ubuntu",
-                "label": "ACTION",
-                "reason": "Specific playbook artifact to produce.",
-                "chain_of_thought": "'Generate an Ansible playbook' — clear artifact request. Standard devops task within existing capabilities. → ACTION"
-            },
-            {
-                "query": "Convert this JSON to YAML: {name: roland, role: admin}",
-                "label": "ACTION",
-                "reason": "Specific data transformation with given input.",
-                "chain_of_thought": "Imperative 'convert' with specific input provided. Immediate transformation, no new skill required. → ACTION"
-            },
-            {
-                "query": "Implement a binary search function in Python",
-                "label": "ACTION",
-                "reason": "Specific code artifact, not a conceptual explanation.",
-                "chain_of_thought": "'Implement' signals code production. 'Binary search in Python' is a standard algorithm — within existing capabilities. → ACTION"
-            },
-
-            # SKILL_NEEDED examples (6)
-            {
-                "query": "Generate a PDF report from this CSV data",
-                "label": "SKILL_NEEDED",
-                "reason": "No PDF generation skill exists.",
-                "chain_of_thought": "User wants a PDF artifact from CSV. Checking skills index: no pdf-generation skill found. A new skill must be created before execution. → SKILL_NEEDED"
-            },
-            {
-                "query": "Send me a Telegram message when disk usage exceeds 90%",
-                "label": "SKILL_NEEDED",
-                "reason": "No Telegram skill exists.",
-                "chain_of_thought": "Requires Telegram bot integration. Checking skills index: no telegram-notify skill found. This is a new capability that needs a skill. → SKILL_NEEDED"
-            },
-            {
-                "query": "Create a Docker Compose file for a Python app with PostgreSQL and Redis",
-                "label": "SKILL_NEEDED",
-                "reason": "No docker-compose skill exists.",
-                "chain_of_thought": "Artifact request for a multi-service Docker Compose. Skills index: no docker-compose-generator skill found. Queuing skill creation. → SKILL_NEEDED"
-            },
-            {
-                "query": "Monitor my SecureBot services and send a daily email summary",
-                "label": "SKILL_NEEDED",
-                "reason": "No email skill exists.",
-                "chain_of_thought": "Requires email integration and service monitoring. Skills index: no email-sender or service-monitor skill found. → SKILL_NEEDED"
-            },
-            {
-                "query": "Convert this markdown file to a Word document",
-                "label": "SKILL_NEEDED",
-                "reason": "No markdown-to-docx skill exists.",
-                "chain_of_thought": "markdown→docx conversion requires pandoc or python-docx integration. Skills index: no markdown-to-docx skill. → SKILL_NEEDED"
-            },
-            {
-                "query": "Set up a Python virtual environment and install dependencies from requirements.txt",
-                "label": "SKILL_NEEDED",
-                "reason": "No python-env-setup skill exists.",
-                "chain_of_thought": "Shell automation for venv + pip install. Skills index: no python-env-setup skill found. Queuing for creation. → SKILL_NEEDED"
-            },
-
-            # CURRENT examples (6)
-            {
-                "query": "What are the latest AI developments in 2026?",
-                "label": "CURRENT",
-                "reason": "Latest and 2026 signal recency beyond 2023 training.",
-                "chain_of_thought": "'Latest' + '2026' both signal real-time information beyond training cutoff. Cannot answer from static knowledge. → CURRENT"
-            },
-            {
-                "query": "What is the current price of Bitcoin?",
-                "label": "CURRENT",
-                "reason": "Prices change in real-time.",
-                "chain_of_thought": "'Current price' is inherently real-time data. Bitcoin price changes every second. Static training data is useless here. → CURRENT"
-            },
-            {
-                "query": "Who won the Super Bowl this year?",
-                "label": "CURRENT",
-                "reason": "Sports results are time-sensitive.",
-                "chain_of_thought": "'This year' signals recency. Sports results are not in training data for current season. Web search required. → CURRENT"
-            },
-            {
-                "query": "What are the latest Ubuntu 24.04 security updates?",
-                "label": "CURRENT",
-                "reason": "Security updates released continuously.",
-                "chain_of_thought": "'Latest' + 'security updates' — CVEs and patches are released daily. Training data is stale for this. → CURRENT"
-            },
-            {
-                "query": "Is there a new version of phi4-mini available?",
-                "label": "CURRENT",
-                "reason": "Model releases happen after training cutoff.",
-                "chain_of_thought": "'New version' of a model released post-cutoff. Model release information requires web search. → CURRENT"
-            },
-            {
-                "query": "What is the current status of the Anthropic API rate limits?",
-                "label": "CURRENT",
-                "reason": "API policies change frequently.",
-                "chain_of_thought": "'Current status' of API policies — these change frequently. Must query live documentation or search. → CURRENT"
-            },
-        ]
-
-        # Embed and store each example
-        seeded_count = 0
-        for example in seed_examples:
-            try:
-                # Get embedding for query
-                embedding = await get_ollama_embedding(example["query"])
-
-                # Store in collection with chain_of_thought in metadata
-                classifier_collection.add(
-                    embeddings=[embedding],
-                    documents=[example["query"]],
-                    metadatas=[{
-                        "query": example["query"],
-                        "label": example["label"],
-                        "reason": example["reason"],
-                        "chain_of_thought": example["chain_of_thought"]
-                    }],
-                    ids=[f"example_{seeded_count}_{datetime.now().timestamp()}"]
-                )
-                seeded_count += 1
-            except Exception as e:
-                print(f"Failed to seed example: {example['query'][:50]}... Error: {e}")
-                continue
+        seed_examples = CLASSIFIER_SEED_EXAMPLES
+
+        # Use the embeddings shipped with the image if they match, otherwise
+        # embed every example query in one batch call; store with one add
+        embeddings = load_seed_embeddings()
+        if embeddings is None:
+            embeddings = await get_embeddings_cached([e["query"] for e in seed_examples])
+        await asyncio.to_thread(
+            classifier_collection.add,
+            embeddings=embeddings,
+            documents=[e["query"] for e in seed_examples],
+            metadatas=[{
+                "query": e["query"],
+                "label": e["label"],
+                "reason": e["reason"],
+                "chain_of_thought": e["chain_of_thought"]
+            } for e in seed_examples],
+            ids=[f"example_{n}_{next_id_suffix()}" for n in range(len(seed_examples))]
+        )
+        _classifier_index = None
+        seeded_count = len(seed_examples)
 
         print(f"Seeded {seeded_count} classifier examples")
         return {"status": "ok", "seeded": seeded_count}
@@ -592,32 +1248,43 @@ async def seed_classifier_examples():
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@protected.post("/summarize/session")
-async def summarize_session():
-    """
-    Summarize current session.md to 200 tokens max
-    Requires HMAC authentication.
-    Save summary and re-embed memory
-    """
+# Summarization jobs run in the background; keep the most recent ones so
+# callers can poll /summarize/session/status/{job_id}
+SUMMARY_JOBS_KEPT = 50
+summary_jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+
+async def _run_summary_job(job_id: str):
+    """Summarize session.md, archive the summary and re-embed memory"""
+    job = summary_jobs[job_id]
+    job["status"] = "running"
     try:
         session_file = MEMORY_DIR / "session.md"
-        if not session_file.exists():
-            raise HTTPException(status_code=404, detail="session.md not found")
-
-        content = session_file.read_text(encoding="utf-8")
+        content = await asyncio.to_thread(session_file.read_text, encoding="utf-8")
 
         # Use Ollama to summarize
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": "phi4-mini:3.8b",
-                    "prompt": f"Summarize this session log concisely in 200 tokens or less. Focus on key tasks, decisions, and outcomes:\n\n{content}",
-                    "stream": False
-                }
-            )
+        payload = {
+            "model": SUMMARY_MODEL,
+            "prompt": f"{SUMMARY_PREFIX}\n\n{content}",
+            "stream": True
+        }
+        if SUMMARY_KEEP_ALIVE:
+            payload["keep_alive"] = SUMMARY_KEEP_ALIVE
+        # Streamed as NDJSON: the timeout bounds the gap between tokens rather
+        # than the whole generation, and no full response body is buffered
+        summary_parts = []
+        async with http_client.stream("POST", "/api/generate", json=payload, timeout=60.0) as response:
             response.raise_for_status()
-            summary = response.json()["response"]
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                part = json.loads(line)
+                if "error" in part:
+                    raise RuntimeError(part["error"])
+                summary_parts.append(part.get("response", ""))
+                if part.get("done"):
+                    break
+        summary = "".join(summary_parts)
 
         # Save summary to archive
         summaries_dir = MEMORY_DIR / "summaries"
@@ -630,23 +1297,61 @@ async def summarize_session():
         # Update session.md with summary
         new_session = f"# Session Log\n\n## Summary (as of {date_str})\n{summary}\n\n## Current Session\n"
         session_file.write_text(new_session, encoding="utf-8")
+        job.update(summary=summary, summary_file=str(summary_file))
 
-        # Re-embed memory
-        await embed_memory_files()
+        # Only session.md changed; soul.md and user.md chunks stay as they are
+        await embed_memory_files(files=["session.md"])
 
-        return {
-            "status": "ok",
-            "summary": summary,
-            "summary_file": str(summary_file)
-        }
+        job["status"] = "done"
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        job.update(status="failed", error=str(e))
+    finally:
+        job["finished"] = datetime.now().isoformat()
+
+
+@protected.post("/summarize/session", status_code=202)
+async def summarize_session(background_tasks: BackgroundTasks):
+    """
+    Summarize current session.md to 200 tokens max
+    Requires HMAC authentication.
+    Returns 202 with a job id at once; the summary is saved and memory
+    re-embedded in the background. Poll /summarize/session/status/{job_id}.
+    """
+    session_file = MEMORY_DIR / "session.md"
+    if not session_file.exists():
+        raise HTTPException(status_code=404, detail="session.md not found")
+
+    # One summarization at a time - a second request joins the running job
+    for job_id, job in summary_jobs.items():
+        if job["status"] in ("queued", "running"):
+            return {"status": "accepted", "job_id": job_id}
+
+    job_id = uuid.uuid4().hex
+    summary_jobs[job_id] = {"status": "queued", "started": datetime.now().isoformat()}
+    while len(summary_jobs) > SUMMARY_JOBS_KEPT:
+        summary_jobs.popitem(last=False)
+
+    background_tasks.add_task(_run_summary_job, job_id)
+    return {"status": "accepted", "job_id": job_id}
+
+
+@protected.get("/summarize/session/status/{job_id}")
+async def summarize_session_status(job_id: str):
+    """Status of a summarization job: queued, running, done or failed"""
+    job = summary_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown summarization job")
+    return {"job_id": job_id, **job}
 
 
 app.include_router(protected)
 
 
 if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--export-seed-embeddings":
+        asyncio.run(export_seed_embeddings(Path(sys.argv[2])))
+        sys.exit(0)
+
     print(f"Starting RAG Service on port 8400")
     print(f"Ollama host: {OLLAMA_HOST}")
     print(f"Memory dir: {MEMORY_DIR}")
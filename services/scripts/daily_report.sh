@@ -55,7 +55,7 @@ fi
 # Summarize session at end of day
 echo "Summarizing session..."
 if curl -s -f -X POST http://localhost:8400/summarize/session > /dev/null 2>&1; then
-    echo "Session summarized and re-embedded"
+    echo "Session summarization started (runs in background)"
 else
     echo "Warning: Session summarization failed (RAG service may be unavailable)"
 fi
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Test Memory Service Body Parsing
+
+Malformed or empty JSON bodies must be rejected with 422, not a 500
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("MEMORY_DIR", tempfile.mkdtemp(prefix="memory_parse_body_"))
+
+sys.path.insert(0, str(Path(__file__).parent / "services" / "memory"))
+
+from fastapi.testclient import TestClient
+
+import memory_service
+
+BAD_BODIES = [b"{bad", b"", b"\xff\xfe", b'{"title": 1}']
+
+
+def test_malformed_body_is_422():
+    # Body parsing is what's under test, not HMAC auth
+    memory_service.app.dependency_overrides[memory_service.auth_required] = lambda: None
+    client = TestClient(memory_service.app)
+    try:
+        for path, method in [("/tasks", "post"), ("/tasks/task_001", "put"), ("/memory/session", "post")]:
+            for body in BAD_BODIES:
+                response = client.request(method, path, content=body,
+                                          headers={"Content-Type": "application/json"})
+                assert response.status_code == 422, (
+                    f"{method.upper()} {path} {body!r}: {response.status_code} {response.text}"
+                )
+                assert isinstance(response.json()["detail"], list)
+    finally:
+        memory_service.app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    test_malformed_body_is_422()
+    print("TEST COMPLETE")
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test RAG Chunking
+
+Checks that split_recursive never produces a chunk over max_tokens,
+including the overlap carried in from the previous chunk
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# rag_service opens ChromaDB and the embedding cache on import
+_tmp = tempfile.mkdtemp(prefix="rag_chunking_")
+os.environ.setdefault("CHROMA_DIR", _tmp)
+os.environ.setdefault("MEMORY_DIR", _tmp)
+
+sys.path.insert(0, str(Path(__file__).parent / "services" / "rag"))
+
+import rag_service
+
+PARAGRAPH = (
+    "SecureBot routes every query through the gateway. The gateway classifies "
+    "intent, pulls relevant memory from the RAG service, and picks a model. "
+    "Short factual questions go to the local model; anything needing fresh "
+    "information goes to search first! Does the overlap stay inside the cap? "
+)
+TEXTS = [
+    PARAGRAPH * 12,
+    "\n\n".join(PARAGRAPH * n for n in range(1, 6)),
+    " ".join(f"word{i}" for i in range(2000)),
+    "https://example.com/" + "x" * 3000 + " trailing words after a very long token",
+]
+
+
+def test_chunks_within_max_tokens():
+    tokenizers = [rag_service.tokenizer]
+    if rag_service.tokenizer is not None:
+        tokenizers.append(None)  # the ~4 chars/token fallback as well
+
+    original = rag_service.tokenizer
+    try:
+        for tok in tokenizers:
+            rag_service.tokenizer = tok
+            for max_tokens, overlap in [(200, 20), (50, 20), (20, 19), (8, 0)]:
+                for text in TEXTS:
+                    chunks = rag_service.split_recursive(text, max_tokens, overlap)
+                    assert chunks, "text produced no chunks"
+                    for chunk in chunks:
+                        tokens = rag_service.count_tokens(chunk)
+                        assert tokens <= max_tokens, (
+                            f"{tokens} tokens > {max_tokens} (overlap {overlap}): {chunk[:60]!r}"
+                        )
+    finally:
+        rag_service.tokenizer = original
+
+
+if __name__ == "__main__":
+    test_chunks_within_max_tokens()
+    print("TEST COMPLETE")